@@ -13,18 +13,220 @@ Requirements:
 
 import os
 import yaml
+import time
+import functools
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from packages.file import file
 from packages.logger import logger
-from packages.jenkins.jenkins_api import JenkinsAPI
-from packages.gitlab.gitlab_api import GitLabAPI
+from packages.jenkins.jenkins_api import (
+    JenkinsAPI, JOBS_TREE, WORKFLOW_JOB_CLASS
+)
+from packages.gitlab.gitlab_api import GitLabAPI, GRAPHQL_BATCH_SIZE
 from packages.helpers.helpers import (
-    is_older_than_three_months, save_to_csv
+    make_age_checker, open_csv_writer, write_job_row
 )
 
 # Initialize logger
 log = logger.get(app_name='logs', enable_logs_file=False)
 
+# Default maximum number of jobs processed concurrently
+MAX_WORKERS = 32
+
+
+def process_one_job(job, jenkins_api, gitlab_api, is_older_than_three_months):
+    """
+    Collect the Jenkins details of a single job.
+
+    The Jenkinsfiles stored in GitLab are not fetched here, so that they can be
+    fetched in batches by `add_jenkinsfile_details`; the modularity details of
+    these jobs are left as None until then.
+
+    Args:
+        job (tuple): A tuple of (job_name, current_path, job_url, job_class)
+                     as returned by `JenkinsAPI.fetch_jobs`.
+        jenkins_api (JenkinsAPI): The Jenkins API client.
+        gitlab_api (GitLabAPI): The GitLab API client.
+        is_older_than_three_months (callable): The checker returned by `make_age_checker`.
+
+    Returns:
+        dict: The processed job data, with a 'jenkinsfile_request' key holding the
+              arguments of `GitLabAPI.get_jenkinsfile_content` if the Jenkinsfile
+              must be fetched, else None.
+
+    """
+    job_name, current_path, job_url, job_class = job
+
+    if job_class in (None, WORKFLOW_JOB_CLASS):
+        # Fetch the job configuration once and extract the pipeline type
+        # (e.g., Pipeline Script, Pipeline Script from SCM), the SCM URL,
+        # the Jenkinsfile path, and the branch specifier (e.g., master, main, etc.)
+        config_fields = jenkins_api.get_job_config_fields(job_url)
+    else:
+        # Only Pipeline jobs have a pipeline definition, so skip fetching the
+        # configuration of other jobs (e.g., Freestyle) and use the defaults
+        config_fields = JenkinsAPI.parse_job_config_fields(None)
+
+    pipeline_type = config_fields["pipeline_type"]
+    jenkinsfile_path = config_fields["jenkinsfile_path"]
+    branch_specifier = config_fields["branch_specifier"]
+
+    # Convert SCM URL to a standard format (e.g., from git@... to https://...)
+    scm_url = gitlab_api.convert_scm_url(config_fields["scm_url"])
+
+    # Determine if the Jenkinsfile is modular or not
+    if pipeline_type in ["Pipeline Script", "Unknown or not a Pipeline job"]:
+        # If the pipeline type is "Pipeline Script" or unknown, it's not modular
+        is_modular = False
+        shared_library = "NA"
+        module_name = "NA"
+        jenkinsfile_request = None
+    else:
+        # The Jenkinsfile must be fetched from GitLab to check its modularity
+        is_modular = shared_library = module_name = None
+        jenkinsfile_request = (
+            scm_url, jenkinsfile_path, branch_specifier, job_name
+        )
+
+    # Extract the team name from the job path (assuming the first part is the team)
+    team = current_path.split(" -> ")[0]
+
+    # Fetch the last run timestamp (in milliseconds) of the job
+    last_run = jenkins_api.fetch_last_run(job_url)
+
+    # Check if the last run is older than 3 months
+    if last_run is None:
+        # If there is no last run, set last run string to "No Runs" and mark as older
+        last_run_str = "No Runs"
+        older_than_three_months = True
+    else:
+        # Format the last run timestamp as a local date and time string
+        last_run_str = time.strftime(
+            "%Y-%m-%d %H:%M:%S", time.localtime(last_run / 1000)
+        )
+        # Determine if the last run is older than three months
+        older_than_three_months = is_older_than_three_months(last_run)
+
+    return {
+        "job_name": job_name,
+        "current_path": current_path,
+        "job_url": job_url,
+        "team": team,
+        "pipeline_type": pipeline_type,
+        "scm_url": scm_url,
+        "jenkinsfile_path": jenkinsfile_path,
+        "branch_specifier": branch_specifier,
+        "is_modular": is_modular,
+        "shared_library": shared_library,
+        "module_name": module_name,
+        "last_run": last_run_str,
+        "older_than_three_months": older_than_three_months,
+        "jenkinsfile_request": jenkinsfile_request,
+    }
+
+
+def add_jenkinsfile_details(processed_jobs, gitlab_api):
+    """
+    Fetch the Jenkinsfiles of processed jobs in one batch and fill in their modularity details.
+
+    Args:
+        processed_jobs (list of dict): The jobs as returned by `process_one_job`.
+        gitlab_api (GitLabAPI): The GitLab API client.
+
+    Returns:
+        None
+
+    """
+    # Get the jobs whose Jenkinsfile must be fetched
+    pending_jobs = [
+        processed_job for processed_job in processed_jobs
+        if processed_job["jenkinsfile_request"] is not None
+    ]
+
+    # Fetch the Jenkinsfile contents from GitLab
+    jenkinsfile_contents = gitlab_api.batch_get_jenkinsfiles([
+        processed_job["jenkinsfile_request"] for processed_job in pending_jobs
+    ])
+
+    for processed_job, jenkinsfile_content in zip(pending_jobs, jenkinsfile_contents):
+        # Check if the Jenkinsfile uses the modular pipeline approach and
+        # parse its shared library and module name
+        (
+            processed_job["is_modular"],
+            processed_job["shared_library"],
+            processed_job["module_name"]
+        ) = gitlab_api.parse_jenkinsfile(jenkinsfile_content)
+
+
+def job_row(processed_job):
+    """
+    Build the CSV row of a processed job.
+
+    Args:
+        processed_job (dict): The job as returned by `process_one_job`.
+
+    Returns:
+        tuple: The processed job data, in the column order of the CSV file.
+
+    """
+    return (
+        processed_job["job_name"], processed_job["current_path"],
+        processed_job["job_url"], processed_job["team"],
+        processed_job["pipeline_type"], processed_job["scm_url"],
+        processed_job["jenkinsfile_path"], processed_job["branch_specifier"],
+        processed_job["is_modular"], processed_job["shared_library"],
+        processed_job["module_name"], processed_job["last_run"],
+        processed_job["older_than_three_months"]
+    )
+
+
+def save_processed_jobs(processed_jobs, gitlab_api, csv_writer, index, total_jobs):
+    """
+    Fill in the Jenkinsfile details of a batch of processed jobs and save them to the CSV file.
+
+    Args:
+        processed_jobs (list of dict): The jobs as returned by `process_one_job`.
+        gitlab_api (GitLabAPI): The GitLab API client.
+        csv_writer (csv.writer): The writer of the CSV file.
+        index (int): The number of jobs saved before this batch.
+        total_jobs (int): The total number of jobs.
+
+    Returns:
+        int: The number of jobs saved, including this batch.
+
+    """
+    add_jenkinsfile_details(processed_jobs, gitlab_api)
+
+    for processed_job in processed_jobs:
+        index += 1
+        log.info('Processed %s out of %s jobs...', index, total_jobs)
+        # Save the processed job data to the CSV file
+        write_job_row(csv_writer, job_row(processed_job))
+
+    return index
+
+
+def read_positive_int(section, key, default):
+    """
+    Read an optional positive integer setting from a section of the configuration.
+
+    Args:
+        section (dict or None): The configuration section; None if it is empty.
+        key (str): The key of the setting.
+        default (int): The value used when the setting is missing.
+
+    Returns:
+        int: The value of the setting.
+
+    Raises:
+        ValueError: If the setting is not a positive integer.
+
+    """
+    value = (section or {}).get(key, default)
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        raise ValueError(f"'{key}' must be a positive integer, got: {value!r}")
+    return value
+
 
 def main():
     """
@@ -38,7 +240,7 @@ def main():
 
     # Get the absolute path of the project directory
     project_abs_path = file.caller_dir_path()
-    log.debug('Project path is: {}'.format(project_abs_path))
+    log.debug('Project path is: %s', project_abs_path)
 
     # Load configurations from the config.yaml file
     config_path = os.path.join(project_abs_path, 'config.yaml')
@@ -51,97 +253,63 @@ def main():
     api_token = config['jenkins']['api_token']
     gitlab_private_token = config['gitlab']['private_token']
 
+    # Number of jobs processed concurrently, which also sizes the connection pools
+    max_workers = read_positive_int(config.get('concurrency'), 'max_workers', MAX_WORKERS)
+
     # Initialize Jenkins API client with URL, username, and API token
-    jenkins_api = JenkinsAPI(jenkins_url, username, api_token)
+    jenkins_api = JenkinsAPI(
+        jenkins_url, username, api_token, max_connections=max_workers
+    )
 
     # Initialize GitLab API client with private token
-    gitlab_api = GitLabAPI(gitlab_private_token)
+    gitlab_api = GitLabAPI(
+        gitlab_private_token, max_connections=max_workers,
+        graphql_batch_size=read_positive_int(
+            config['gitlab'], 'graphql_batch_size', GRAPHQL_BATCH_SIZE
+        )
+    )
 
     # Construct Jenkins API endpoint URL to fetch jobs
-    base_url = (
-        f"{jenkins_url}/api/json?tree=jobs[name,url,jobs[name,url]]"
-    )
+    base_url = f"{jenkins_url}/api/json?tree={JOBS_TREE}"
 
     # Fetch all jobs from Jenkins using the API client
     jobs = jenkins_api.fetch_jobs(base_url)
 
-    # Initialize list to hold processed job data
-    processed_jobs = []
-
     # Get the total number of jobs fetched
     total_jobs = len(jobs)
 
-    # Iterate over each job and process it
-    for index, (job_name, current_path, job_url) in enumerate(jobs, start=1):
-        print(f"Processing {index} out of {total_jobs} jobs...")
-
-        # Fetch the pipeline type (e.g., Pipeline Script, Pipeline Script from SCM)
-        pipeline_type = jenkins_api.get_pipeline_type(job_url)
-
-        # Fetch the SCM URL (e.g., Git repository URL)
-        scm_url = jenkins_api.get_scm_url(job_url)
-
-        # Convert SCM URL to a standard format (e.g., from git@... to https://...)
-        scm_url = gitlab_api.convert_scm_url(scm_url)
+    # Open the CSV file so that each job is saved as soon as it is processed
+    csv_file, csv_writer = open_csv_writer()
 
-        # Fetch the Jenkinsfile path from the job configuration
-        jenkinsfile_path = jenkins_api.get_jenkinsfile_path(job_url)
-
-        # Fetch the branch specifier (e.g., master, main, etc.) from the job configuration
-        branch_specifier = jenkins_api.get_branch_specifier(job_url)
-
-        # Initialize variables for shared library and module name
-        shared_library = "NA"
-        module_name = "NA"
-
-        # Determine if the Jenkinsfile is modular or not
-        if pipeline_type in ["Pipeline Script", "Unknown or not a Pipeline job"]:
-            # If the pipeline type is "Pipeline Script" or unknown, it's not modular
-            is_modular = False
-        else:
-            # Fetch the Jenkinsfile content from GitLab
-            jenkinsfile_content = gitlab_api.get_jenkinsfile_content(
-                scm_url, jenkinsfile_path, branch_specifier, job_name
-            )
-
-            # Check if the Jenkinsfile uses the modular pipeline approach
-            is_modular = gitlab_api.check_modularity(jenkinsfile_content)
-
-            if is_modular:
-                # Parse the shared library used in the Jenkinsfile
-                shared_library = gitlab_api.parse_shared_library(jenkinsfile_content)
-                if shared_library == "No Shared Library":
-                    module_name = "NA"
-                else:
-                    # Parse the module name from the Jenkinsfile content
-                    module_name = gitlab_api.parse_module_name(jenkinsfile_content)
-
-        # Extract the team name from the job path (assuming the first part is the team)
-        team = current_path.split(" -> ")[0]
-
-        # Fetch the last run date of the job
-        last_run = jenkins_api.fetch_last_run(job_url)
-
-        # Check if the last run is older than 3 months
-        if last_run is None:
-            # If there is no last run, set last run string to "No Runs" and mark as older
-            last_run_str = "No Runs"
-            older_than_three_months = True
-        else:
-            # Format the last run datetime as a string
-            last_run_str = last_run.strftime("%Y-%m-%d %H:%M:%S")
-            # Determine if the last run is older than three months
-            older_than_three_months = is_older_than_three_months(last_run)
-
-        # Append the processed job data to the list
-        processed_jobs.append((
-            job_name, current_path, job_url, team, pipeline_type,
-            scm_url, jenkinsfile_path, branch_specifier, is_modular,
-            shared_library, module_name, last_run_str, older_than_three_months
-        ))
-
-    # Save the processed jobs data to a CSV file
-    save_to_csv(processed_jobs)
+    # Process the jobs concurrently; each job is dominated by network latency,
+    # so the threads spend most of their time waiting on Jenkins and GitLab.
+    # `executor.map` yields the results in the same order as `jobs`.
+    process_job = functools.partial(
+        process_one_job, jenkins_api=jenkins_api, gitlab_api=gitlab_api,
+        is_older_than_three_months=make_age_checker(threshold_days=90)
+    )
+    with csv_file, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        index = 0
+
+        # Collect the processed jobs until a full batch of them needs a Jenkinsfile,
+        # so that these Jenkinsfiles are fetched together while the next jobs are
+        # still being processed
+        batch = []
+        batch_requests_count = 0
+        for processed_job in executor.map(process_job, jobs):
+            batch.append(processed_job)
+            if processed_job["jenkinsfile_request"] is not None:
+                batch_requests_count += 1
+
+            if batch_requests_count == gitlab_api.graphql_batch_size:
+                index = save_processed_jobs(
+                    batch, gitlab_api, csv_writer, index, total_jobs
+                )
+                batch = []
+                batch_requests_count = 0
+
+        # Save the jobs of the last, partial batch
+        save_processed_jobs(batch, gitlab_api, csv_writer, index, total_jobs)
 
     # Log the end of the program
     log.info('Finished program execution')
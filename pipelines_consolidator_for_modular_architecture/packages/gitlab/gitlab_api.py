@@ -5,16 +5,21 @@ This module contains the `GitLabAPI` class for interacting with GitLab.
 
 API Endpoints Used:
 - GET `/api/v4/projects/:id/repository/files/:file_path/raw?ref=:branch`: Fetch raw file content from a repository.
+- POST `/api/graphql`: Fetch the content of files from many repositories at once.
 
 The `GitLabAPI` class provides methods to fetch Jenkinsfile content from GitLab repositories,
 check for modularity in Jenkinsfiles, and parse shared libraries and module names.
 
 """
 
+import orjson
 import requests
 import re
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
 from urllib3.exceptions import InsecureRequestWarning
 import logging
+from packages.helpers.helpers import create_session
 
 # Import logger
 log = logging.getLogger(__name__)
@@ -22,30 +27,77 @@ log = logging.getLogger(__name__)
 # Disable warnings related to insecure SSL requests
 requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
 
+# Base URL of the GitLab server
+GITLAB_URL = "https://git.org-country.internal.replace-organization-name.com"
+
+# Number of Jenkinsfiles fetched with a single GraphQL request; each one adds
+# a project, a repository and up to two blobs fields to the query, which must
+# stay below the query complexity limit of GitLab (250 for authenticated users)
+GRAPHQL_BATCH_SIZE = 20
+
+# Pattern to convert git@ or git:// URLs to https:// format
+_SCM_CONVERT_RE = re.compile(r'(?:git@)?(.*?):')
+
+# Pattern to extract project path from SCM URL ending with .git
+_PROJECT_PATH_RE_GIT = re.compile(
+    r'https://git\.org-country\.internal\.replace-organization-name\.com/(.*)\.git'
+)
+
+# Pattern for SCM URLs without .git suffix
+_PROJECT_PATH_RE_NOGIT = re.compile(
+    r'https://git\.org-country\.internal\.replace-organization-name\.com/(.*)'
+)
+
+# Pattern to match the libraries of the @Library directive
+_LIBRARY_RE = re.compile(r"@Library\(\['([^\]]+?)'\]\)_")
+
+# Pattern to match function calls at the start of a line (e.g., module calls)
+_MODULE_RE = re.compile(r'^\s*(\w+)\s*\(', re.MULTILINE)
+
+# Number of leading characters of a Jenkinsfile searched first for the module call
+MODULE_SEARCH_WINDOW = 4096
+
 class GitLabAPI:
     """
     Class to interact with GitLab API.
 
     Attributes:
         gitlab_private_token (str): The private token for authenticating with the GitLab API.
+        session (requests.Session): The authenticated session used for all requests.
+        max_connections (int): The number of connections kept alive to GitLab, also used
+            as the number of threads fetching the Jenkinsfiles of a failed GraphQL batch.
+        graphql_batch_size (int): The number of Jenkinsfiles fetched with a single GraphQL request.
 
     Methods:
         convert_scm_url(scm_url): Converts an SCM URL to HTTPS format.
         get_jenkinsfile_content(scm_url, jenkinsfile_path, branch_specifier, job_name):
             Fetches the Jenkinsfile content from the GitLab repository.
+        batch_get_jenkinsfiles(jenkinsfile_requests): Fetches the content of many Jenkinsfiles
+            with GraphQL requests.
+        parse_jenkinsfile(jenkinsfile_content): Checks the modularity, shared library, and module
+            name of the Jenkinsfile in one call.
         check_modularity(jenkinsfile_content): Checks if the Jenkinsfile is modular.
         parse_shared_library(jenkinsfile_content): Parses the shared library from the Jenkinsfile content.
         parse_module_name(jenkinsfile_content): Parses the module name from the Jenkinsfile content.
 
     """
-    def __init__(self, gitlab_private_token):
+    def __init__(self, gitlab_private_token, max_connections=64,
+                 graphql_batch_size=GRAPHQL_BATCH_SIZE):
         """
         Initialize GitLabAPI with the private token.
 
         Args:
             gitlab_private_token (str): The private token for authenticating with GitLab API.
+            max_connections (int): The number of connections kept alive to GitLab.
+            graphql_batch_size (int): The number of Jenkinsfiles fetched with a single GraphQL request.
         """
         self.gitlab_private_token = gitlab_private_token
+        self.max_connections = max_connections
+        self.graphql_batch_size = graphql_batch_size
+        self.session = create_session(
+            headers={"Private-Token": gitlab_private_token},
+            pool_maxsize=max_connections
+        )
 
     def convert_scm_url(self, scm_url):
         """
@@ -64,7 +116,7 @@ class GitLabAPI:
         if scm_url.startswith("https://"):
             return scm_url
         # Convert git@ or git:// URLs to https:// format
-        return re.sub(r'(?:git@)?(.*?):', r'https://\1/', scm_url)
+        return _SCM_CONVERT_RE.sub(r'https://\1/', scm_url)
 
     def get_jenkinsfile_content(
         self, scm_url, jenkinsfile_path, branch_specifier, job_name
@@ -79,9 +131,9 @@ class GitLabAPI:
             job_name (str): The name of the Jenkins job.
 
         Returns:
-            str or None: The content of the Jenkinsfile if fetched successfully,
-                         or a string indicating the error (e.g., 'Project Not Found'),
-                         or None if not found.
+            bytes or str or None: The raw (undecoded) content of the Jenkinsfile if
+                                  fetched successfully, or a string indicating the
+                                  error (e.g., 'Project Not Found'), or None if not found.
 
         GitLab API Endpoint Used:
             - GET `/api/v4/projects/:id/repository/files/:file_path/raw?ref=:branch`
@@ -93,50 +145,35 @@ class GitLabAPI:
         if scm_url == "NA" or jenkinsfile_path == "NA":
             return None
 
-        # Handle branch specifiers; if '**' or 'Any', try default branches
-        if branch_specifier in ["**", "Any"]:
-            branches_to_try = ["main", "master"]
-        else:
-            # Remove any wildcards or patterns from branch specifier
-            branches_to_try = [branch_specifier.replace("*/", "")]
+        branches_to_try = self._branches_to_try(branch_specifier)
 
-        # Encode slashes in the Jenkinsfile path for GitLab API
-        jenkinsfile_path_encoded = jenkinsfile_path.replace("/", "%2F")
+        # Encode the Jenkinsfile path for GitLab API
+        jenkinsfile_path_encoded = quote(jenkinsfile_path, safe='')
 
-        for branch in branches_to_try:
-            # Extract project path from SCM URL
-            if scm_url.endswith(".git"):
-                # Pattern to extract project path from SCM URL ending with .git
-                pattern = r'https://git\.org-country\.internal\.replace-organization-name\.com/(.*)\.git'
-            else:
-                # Pattern for SCM URLs without .git suffix
-                pattern = r'https://git\.org-country\.internal\.replace-organization-name\.com/(.*)'
-
-            # Extract the project path
-            project_path = re.sub(pattern, r'\1', scm_url)
-
-            # Encode slashes in the project path for the GitLab API
-            project_path_encoded = project_path.replace('/', '%2F')
+        # Encode the project path for the GitLab API
+        project_path_encoded = quote(self._project_path(scm_url), safe='')
 
+        for branch in branches_to_try:
             # Construct the Jenkinsfile API URL
             jenkinsfile_url = (
-                f"https://git.org-country.internal.replace-organization-name.com/api/v4/projects/"
+                f"{GITLAB_URL}/api/v4/projects/"
                 f"{project_path_encoded}/repository/files/"
                 f"{jenkinsfile_path_encoded}/raw?ref={branch}"
             )
 
             # Send GET request to fetch the Jenkinsfile content
-            response = requests.get(
-                jenkinsfile_url,
-                headers={"Private-Token": self.gitlab_private_token},
-                verify=False
-            )
+            response = self.session.get(jenkinsfile_url)
 
             # Check if the response is successful
             if response.status_code == 200:
-                # Return the Jenkinsfile content
-                return response.text
+                # Return the raw Jenkinsfile content; it is only decoded by
+                # `parse_jenkinsfile` when it turns out to be modular
+                return response.content
             else:
+                # Decode the body as UTF-8 directly; GitLab does not declare a
+                # charset, which would make requests guess the encoding
+                response_text = response.content.decode('utf-8', errors='replace')
+
                 # Log detailed information on failed fetch
                 log.error(f"""Failed to fetch Jenkinsfile for job '{job_name}'
                           - Git URL: {scm_url}
@@ -144,25 +181,234 @@ class GitLabAPI:
                           - Jenkinsfile Path: {jenkinsfile_path}
                           - Request URL: {jenkinsfile_url}
                           - Response Code: {response.status_code}
-                          - Response Content: {response.text}""")
+                          - Response Content: {response_text}""")
 
                 # Handle specific error messages in the response
-                if "Project Not Found" in response.text:
+                if "Project Not Found" in response_text:
                     return "Project Not Found"
-                elif "File Not Found" in response.text:
+                elif "File Not Found" in response_text:
                     return "Jenkinsfile Not Found"
-                elif "Commit Not Found" in response.text:
+                elif "Commit Not Found" in response_text:
                     return "Branch Not Found"
 
         # If none of the branches resulted in a successful fetch
         return None
 
+    def batch_get_jenkinsfiles(self, jenkinsfile_requests):
+        """
+        Fetch the content of many Jenkinsfiles with GraphQL requests.
+
+        Up to `graphql_batch_size` Jenkinsfiles are fetched per request, each from
+        the first of its candidate branches that contains it. If a GraphQL request
+        fails, the Jenkinsfiles of that batch are fetched concurrently, one per
+        request, with `get_jenkinsfile_content` instead.
+
+        Args:
+            jenkinsfile_requests (list of tuples): A list containing tuples of
+                (scm_url, jenkinsfile_path, branch_specifier, job_name), as passed
+                to `get_jenkinsfile_content`.
+
+        Returns:
+            list: The result for each request, in the same order: the content of the
+                  Jenkinsfile (str, or bytes when fetched with the fallback),
+                  'Project Not Found', 'Jenkinsfile Not Found', or None.
+
+        GitLab API Endpoint Used:
+            - POST `/api/graphql`
+
+        """
+        results = [None] * len(jenkinsfile_requests)
+
+        # Skip the requests without a repository or a Jenkinsfile
+        pending = [
+            index for index, (scm_url, jenkinsfile_path, _, _) in enumerate(jenkinsfile_requests)
+            if scm_url != "NA" and jenkinsfile_path != "NA"
+        ]
+
+        for start in range(0, len(pending), self.graphql_batch_size):
+            batch = pending[start:start + self.graphql_batch_size]
+            batch_requests = [jenkinsfile_requests[index] for index in batch]
+            for index, result in zip(batch, self._graphql_get_jenkinsfiles(batch_requests)):
+                results[index] = result
+
+        return results
+
+    def _graphql_get_jenkinsfiles(self, jenkinsfile_requests):
+        """
+        Fetch the content of Jenkinsfiles with a single GraphQL request.
+
+        Args:
+            jenkinsfile_requests (list of tuples): A list containing tuples of
+                (scm_url, jenkinsfile_path, branch_specifier, job_name).
+
+        Returns:
+            list: The result for each request, as returned by `batch_get_jenkinsfiles`.
+
+        """
+        # Build one aliased project field per request, with one aliased blobs
+        # field per candidate branch; all values are passed as variables
+        variable_definitions = []
+        variables = {}
+        fields = []
+        for index, (scm_url, jenkinsfile_path, branch_specifier, _) in enumerate(
+            jenkinsfile_requests
+        ):
+            variable_definitions.append(f"$project{index}: ID!, $path{index}: String!")
+            variables[f"project{index}"] = self._project_path(scm_url)
+            variables[f"path{index}"] = jenkinsfile_path
+
+            blobs_fields = []
+            for branch_index, branch in enumerate(self._branches_to_try(branch_specifier)):
+                variable_definitions.append(f"$ref{index}_{branch_index}: String!")
+                variables[f"ref{index}_{branch_index}"] = branch
+                blobs_fields.append(
+                    f"b{branch_index}: blobs(paths: [$path{index}], "
+                    f"ref: $ref{index}_{branch_index}) {{ nodes {{ rawBlob }} }}"
+                )
+
+            fields.append(
+                f"j{index}: project(fullPath: $project{index}) "
+                f"{{ repository {{ {' '.join(blobs_fields)} }} }}"
+            )
+
+        query = f"query({', '.join(variable_definitions)}) {{ {' '.join(fields)} }}"
+
+        # Send POST request to fetch the Jenkinsfiles
+        response = self.session.post(
+            f"{GITLAB_URL}/api/graphql", json={"query": query, "variables": variables}
+        )
+        data = None
+        if response.status_code == 200:
+            try:
+                data = orjson.loads(response.content).get("data")
+            except (orjson.JSONDecodeError, AttributeError):
+                # Not a GraphQL response, e.g. a proxy or login page
+                data = None
+
+        if not data:
+            # Fall back to fetching the Jenkinsfiles one per request, concurrently
+            log.error(
+                f"Failed to fetch {len(jenkinsfile_requests)} Jenkinsfiles with GraphQL"
+                f" - Response Code: {response.status_code}"
+                f" - Response Content: {response.content.decode('utf-8', errors='replace')}"
+            )
+            max_workers = min(self.max_connections, len(jenkinsfile_requests))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                return list(executor.map(
+                    lambda jenkinsfile_request: self.get_jenkinsfile_content(*jenkinsfile_request),
+                    jenkinsfile_requests
+                ))
+
+        results = []
+        for index, (scm_url, jenkinsfile_path, branch_specifier, job_name) in enumerate(
+            jenkinsfile_requests
+        ):
+            project = data.get(f"j{index}")
+            if project is None:
+                result = "Project Not Found"
+            else:
+                # Take the Jenkinsfile from the first branch that contains it
+                repository = project.get("repository") or {}
+                result = next(
+                    (
+                        blobs["nodes"][0]["rawBlob"]
+                        for blobs in repository.values()
+                        if blobs and blobs["nodes"]
+                    ),
+                    "Jenkinsfile Not Found"
+                )
+
+            if result in ["Project Not Found", "Jenkinsfile Not Found"]:
+                # Log detailed information on failed fetch
+                log.error(f"""Failed to fetch Jenkinsfile for job '{job_name}'
+                          - Git URL: {scm_url}
+                          - Branches: {self._branches_to_try(branch_specifier)}
+                          - Jenkinsfile Path: {jenkinsfile_path}
+                          - Error: {result}""")
+
+            results.append(result)
+
+        return results
+
+    @staticmethod
+    def _branches_to_try(branch_specifier):
+        """
+        Get the branches to look for the Jenkinsfile in, in order.
+
+        Args:
+            branch_specifier (str): The branch name or pattern.
+
+        Returns:
+            list of str: The branch names.
+
+        """
+        # Handle branch specifiers; if '**' or 'Any', try default branches
+        if branch_specifier in ["**", "Any"]:
+            return ["main", "master"]
+        # Remove any wildcards or patterns from branch specifier
+        return [branch_specifier.replace("*/", "")]
+
+    @staticmethod
+    def _project_path(scm_url):
+        """
+        Extract the project path (e.g., 'group/project') from an SCM URL.
+
+        Args:
+            scm_url (str): The SCM URL in https:// format.
+
+        Returns:
+            str: The project path.
+
+        """
+        if scm_url.endswith(".git"):
+            pattern = _PROJECT_PATH_RE_GIT
+        else:
+            pattern = _PROJECT_PATH_RE_NOGIT
+        return pattern.sub(r'\1', scm_url)
+
+    def parse_jenkinsfile(self, jenkinsfile_content):
+        """
+        Extract the modularity details of a Jenkinsfile.
+
+        The shared library is only parsed when `check_modularity` does not
+        return False, and the module name only when a shared library is used.
+        Raw (bytes) content is only decoded when it is modular.
+
+        Args:
+            jenkinsfile_content (bytes or str or None): The content of the Jenkinsfile.
+
+        Returns:
+            tuple: A tuple of (is_modular, shared_library, module_name), where
+                   is_modular is the result of `check_modularity`, and the
+                   shared library and module name are 'NA' when not applicable.
+
+        """
+        shared_library = "NA"
+        module_name = "NA"
+
+        # Check if the Jenkinsfile uses the modular pipeline approach
+        is_modular = self.check_modularity(jenkinsfile_content)
+
+        if is_modular:
+            # Decode the raw content now that it needs to be parsed
+            if isinstance(jenkinsfile_content, bytes):
+                jenkinsfile_content = jenkinsfile_content.decode('utf-8', errors='replace')
+
+            # Parse the shared library used in the Jenkinsfile
+            shared_library = self.parse_shared_library(jenkinsfile_content)
+            if shared_library != "No Shared Library":
+                # Parse the module name from the Jenkinsfile content
+                module_name = self.parse_module_name(jenkinsfile_content)
+
+        return is_modular, shared_library, module_name
+
     def check_modularity(self, jenkinsfile_content):
         """
         Check if the Jenkinsfile is modular by inspecting its content.
 
         Args:
-            jenkinsfile_content (str): The content of the Jenkinsfile.
+            jenkinsfile_content (bytes or str or None): The content of the Jenkinsfile;
+                                                        raw bytes are searched without decoding.
 
         Returns:
             bool or str: Returns True if the Jenkinsfile is modular,
@@ -172,6 +418,8 @@ class GitLabAPI:
         """
         if jenkinsfile_content is None:
             return "Failed to fetch Jenkinsfile"
+        elif isinstance(jenkinsfile_content, bytes):
+            return b"cicd-modular-library" in jenkinsfile_content
         elif "cicd-modular-library" in jenkinsfile_content:
             return True
         else:
@@ -195,11 +443,11 @@ class GitLabAPI:
         if not isinstance(jenkinsfile_content, str):
             # Log a warning and return default value
             log.warning("Invalid Jenkinsfile content: Expected a string.")
-            log.warning("Jenkinsfile content: {}".format(jenkinsfile_content))
+            log.warning("Jenkinsfile content: %s", jenkinsfile_content)
             return "No Shared Library"
 
         # Modify the regular expression to correctly match libraries
-        library_match = re.search(r"@Library\(\['([^\]]+?)'\]\)_", jenkinsfile_content)
+        library_match = _LIBRARY_RE.search(jenkinsfile_content)
 
         if library_match:
             # Split the libraries by comma
@@ -211,7 +459,7 @@ class GitLabAPI:
         else:
             shared_library = "No Shared Library"
 
-        log.info("Shared library is: {}".format(shared_library))
+        log.info("Shared library is: %s", shared_library)
 
         return shared_library
 
@@ -233,12 +481,16 @@ class GitLabAPI:
         if not isinstance(jenkinsfile_content, str):
             # Log a warning and return default value
             log.warning("Invalid Jenkinsfile content: Expected a string.")
-            log.warning("Jenkinsfile content: {}".format(jenkinsfile_content))
+            log.warning("Jenkinsfile content: %s", jenkinsfile_content)
             return "No Module Detected"
 
         # Ensure we skip the @Library directive and only detect actual module function calls
         # Look for function call patterns but avoid matching @Library
-        module_match = re.search(r'^\s*(\w+)\s*\(', jenkinsfile_content, re.MULTILINE)
+        # The module call is almost always near the top of the file, so search the
+        # beginning first and only scan the whole content if nothing is found there
+        module_match = _MODULE_RE.search(jenkinsfile_content, 0, MODULE_SEARCH_WINDOW)
+        if module_match is None and len(jenkinsfile_content) > MODULE_SEARCH_WINDOW:
+            module_match = _MODULE_RE.search(jenkinsfile_content)
 
         if module_match and module_match.group(1) != 'Library':
             # Return the module name found (e.g., BigDataGenericPipeline)
@@ -247,6 +499,6 @@ class GitLabAPI:
             # Return if no module is detected
             module_name = "No Module Detected"
 
-        log.info("Detected module name: '{}'".format(module_name))
+        log.info("Detected module name: '%s'", module_name)
 
         return module_name
@@ -1,35 +1,163 @@
 """
 Helper functions module.
 
-This module contains helper functions used across the project, such as checking
-if a date is older than three months and saving data to a CSV file.
+This module contains helper functions used across the project, such as creating
+pooled HTTP sessions, checking if a date is older than three months and saving
+data to a CSV file.
 
 Functions:
-    is_older_than_three_months(last_run): Checks if a datetime is older than three months.
+    create_session(auth, headers, cache_name, pool_maxsize): Creates a pooled, cached HTTP session with retries.
+    make_age_checker(threshold_days): Creates a function that checks if a timestamp is too old.
+    open_csv_writer(filename): Opens a CSV file and writes its header row.
+    write_job_row(writer, job): Writes a single job to the CSV file.
     save_to_csv(jobs, filename): Saves job data to a CSV file.
 
 """
 
+import os
 import csv
-from datetime import datetime, timedelta
+import time
+from datetime import timedelta
+from requests.adapters import HTTPAdapter
+from requests_cache import CachedSession, DEFAULT_IGNORED_PARAMS, DO_NOT_CACHE
+from urllib3.util.retry import Retry
 
+# Header row of the CSV file
+CSV_HEADER = [
+    "job_name", "path", "job_url", "team", "pipeline_type", "scm_url",
+    "jenkinsfile_path", "branch_specifier", "is_modular",
+    "shared_library", "shared_library_module", "last_run", "Is_last_run_old"
+]
 
-def is_older_than_three_months(last_run):
+# How long the job configurations and Jenkinsfiles are served from the cache
+CACHE_EXPIRE_AFTER = timedelta(hours=6)
+
+# Only the responses that rarely change are cached; job lists, last builds,
+# and crumbs are always fetched again
+CACHE_URLS_EXPIRE_AFTER = {
+    "*/config.xml": CACHE_EXPIRE_AFTER,
+    "*/repository/files/*/raw": CACHE_EXPIRE_AFTER,
+}
+
+# Headers and parameters that are never written to the cache; the defaults
+# cover `Authorization`, but not the `Private-Token` header of GitLab
+CACHE_IGNORED_PARAMETERS = [*DEFAULT_IGNORED_PARAMS, "Private-Token"]
+
+
+def create_session(
+    auth=None, headers=None, cache_name="data/cache/http_cache", pool_maxsize=64
+):
+    """
+    Create an HTTP session that reuses connections, retries transient errors,
+    and caches job configurations and Jenkinsfiles on disk between runs.
+
+    Args:
+        auth (tuple or None): The (username, password) pair sent with every request.
+        headers (dict or None): Default headers sent with every request.
+        cache_name (str): The path of the SQLite cache file, without extension.
+        pool_maxsize (int): The number of connections kept alive per host; should be
+                            at least the number of threads sharing the session.
+
+    Returns:
+        requests_cache.CachedSession: The configured session.
+
+    """
+    session = CachedSession(
+        cache_name, backend="sqlite", allowable_methods=["GET"],
+        expire_after=DO_NOT_CACHE, urls_expire_after=CACHE_URLS_EXPIRE_AFTER,
+        ignored_parameters=CACHE_IGNORED_PARAMETERS
+    )
+
+    # Keep up to `pool_maxsize` connections alive per host and retry gateway errors;
+    # once the retries are used up, return the last response instead of raising,
+    # so that the callers handle it like any other failed response
+    adapter = HTTPAdapter(
+        pool_connections=32, pool_maxsize=pool_maxsize,
+        max_retries=Retry(
+            total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504],
+            raise_on_status=False
+        )
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    # Set the default authentication and headers
+    session.auth = auth
+    if headers:
+        session.headers.update(headers)
+
+    # The servers use internal certificates
+    session.verify = False
+
+    return session
+
+
+def make_age_checker(threshold_days=90):
     """
-    Check if the last run is older than three months.
+    Create a function that checks if a timestamp is older than a threshold.
+
+    The cutoff timestamp is computed once, when the checker is created, instead
+    of on every check.
 
     Args:
-        last_run (datetime): The datetime of the last run.
+        threshold_days (int): The age in days after which a timestamp is considered old.
 
     Returns:
-        bool or None: True if older than three months, False if not, None if last_run is None.
+        callable: A function that takes the timestamp of the last run in milliseconds
+                  and returns True if older than the threshold, False if not,
+                  None if the last run is None.
+
+    """
+    # Calculate the timestamp `threshold_days` ago from now, in milliseconds
+    cutoff_ms = (time.time() - threshold_days * 24 * 60 * 60) * 1000
+
+    def is_older(last_run_ms):
+        if last_run_ms is None:
+            return None
+        return last_run_ms < cutoff_ms
+
+    return is_older
+
+
+def open_csv_writer(filename="data/output/results.csv"):
+    """
+    Open the CSV file for writing and write its header row.
+
+    Args:
+        filename (str): The filename where to save the CSV data.
+
+    Returns:
+        tuple: A tuple of (file, writer); the caller is responsible for closing the file.
+
+    """
+    # Create the output directory if it does not exist
+    output_dir = os.path.dirname(filename)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    # Use a large write buffer so rows are written to disk in big chunks
+    file = open(filename, mode="w", newline="", buffering=1024 * 1024)
+    writer = csv.writer(file)
+
+    # Write header row
+    writer.writerow(CSV_HEADER)
+
+    return file, writer
+
+
+def write_job_row(writer, job):
+    """
+    Write the information of a single job to the CSV file.
+
+    Args:
+        writer (csv.writer): The writer returned by `open_csv_writer`.
+        job (tuple): The job data to save.
+
+    Returns:
+        None
 
     """
-    if last_run is None:
-        return None
-    # Calculate the date three months ago from today
-    three_months_ago = datetime.now() - timedelta(days=90)
-    return last_run < three_months_ago
+    writer.writerow(job)
 
 
 def save_to_csv(jobs, filename="data/output/results.csv"):
@@ -44,14 +172,7 @@ def save_to_csv(jobs, filename="data/output/results.csv"):
         None
 
     """
-    with open(filename, mode="w", newline="") as file:
-        writer = csv.writer(file)
-        # Write header row
-        writer.writerow([
-            "job_name", "path", "job_url", "team", "pipeline_type", "scm_url",
-            "jenkinsfile_path", "branch_specifier", "is_modular",
-            "shared_library", "shared_library_module", "last_run", "Is_last_run_old"
-        ])
+    file, writer = open_csv_writer(filename)
+    with file:
         # Write job data rows
-        for job in jobs:
-            writer.writerow(job)
+        writer.writerows(jobs)
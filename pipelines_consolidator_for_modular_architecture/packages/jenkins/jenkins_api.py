@@ -4,8 +4,9 @@ Jenkins API module.
 This module contains the `JenkinsAPI` class for interacting with Jenkins.
 
 API Endpoints Used:
-- GET `/crumbIssuer/api/json`: Fetch the Jenkins crumb for CSRF protection.
-- GET `/api/json?tree=jobs[name,url,jobs[name,url]]`: Fetch jobs with their names and URLs.
+- GET `/crumbIssuer/api/json`: Fetch the Jenkins crumb for CSRF protection, only on demand.
+- GET `/api/json?tree=jobs[name,url,_class,jobs[...]]`: Fetch jobs with their names, URLs,
+  and classes, several folder levels deep.
 - GET `/lastBuild/api/json`: Fetch details of the last build of a job.
 - GET `/config.xml`: Fetch the configuration XML of a job.
 
@@ -14,14 +15,62 @@ pipeline types, SCM URLs, Jenkinsfile paths, and branch specifiers from Jenkins.
 
 """
 
+import orjson
 import requests
-import xml.etree.ElementTree as ET
-from datetime import datetime
+from functools import cached_property
+from lxml import etree
 from urllib3.exceptions import InsecureRequestWarning
+from packages.helpers.helpers import create_session
 
 # Disable warnings related to insecure SSL requests
 requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
 
+# Number of job levels (folders included) fetched with a single request
+JOBS_TREE_DEPTH = 4
+
+
+def build_jobs_tree(depth=JOBS_TREE_DEPTH):
+    """
+    Build the `tree` query parameter used to fetch nested jobs.
+
+    The innermost level also requests the names of its nested jobs, only so
+    that its folders can be told apart from its jobs.
+
+    Args:
+        depth (int): The number of nested job levels to fetch.
+
+    Returns:
+        str: The tree parameter (e.g.,
+             'jobs[name,url,_class,jobs[name,url,_class,jobs[name]]]' for a depth of 2).
+
+    """
+    jobs_tree = "jobs[name,url,_class,jobs[name]]"
+    for _ in range(depth - 1):
+        jobs_tree = f"jobs[name,url,_class,{jobs_tree}]"
+    return jobs_tree
+
+
+# Tree query parameter used to fetch the jobs
+JOBS_TREE = build_jobs_tree()
+
+# Class of Pipeline jobs, the only jobs with a pipeline definition in their configuration
+WORKFLOW_JOB_CLASS = "org.jenkinsci.plugins.workflow.job.WorkflowJob"
+
+# Compiled XPath expressions used to extract fields from the job configuration
+_XPATH_PIPELINE_SCRIPT = etree.XPath(
+    ".//definition[@class='org.jenkinsci.plugins.workflow.cps.CpsFlowDefinition']"
+)
+_XPATH_PIPELINE_SCRIPT_FROM_SCM = etree.XPath(
+    ".//definition[@class='org.jenkinsci.plugins.workflow.cps.CpsScmFlowDefinition']"
+)
+_XPATH_SCM_URL = etree.XPath(
+    "(.//scm[@class='hudson.plugins.git.GitSCM'])[1]/userRemoteConfigs[1]//url"
+)
+_XPATH_JENKINSFILE_PATH = etree.XPath(".//definition/scriptPath")
+_XPATH_BRANCH_SPECIFIER = etree.XPath(
+    "(.//scm[@class='hudson.plugins.git.GitSCM']/branches)[1]//name"
+)
+
 class JenkinsAPI:
     """
     Class to interact with Jenkins API.
@@ -30,19 +79,27 @@ class JenkinsAPI:
         jenkins_url (str): The base URL of the Jenkins server.
         username (str): The username for authentication.
         api_token (str): The API token or password for authentication.
-        crumb (str): The Jenkins crumb for CSRF protection.
+        session (requests.Session): The authenticated session used for all requests.
+        crumb (str): The Jenkins crumb for CSRF protection, fetched on first access only;
+            the read-only requests of this class do not access it, so they are sent
+            without a crumb header.
 
     Methods:
         get_crumb(): Fetches the Jenkins crumb for CSRF protection.
         fetch_jobs(api_url, parent_path): Recursively fetches all Jenkins jobs.
         fetch_last_run(job_url): Fetches the last run timestamp of a job.
+        get_job_config(job_url): Fetches and parses the configuration XML of a job.
+        get_job_config_fields(job_url): Fetches all the configuration fields of a job at once.
         get_pipeline_type(job_url): Determines the pipeline type of a job.
         get_scm_url(job_url): Fetches the SCM URL from the job configuration.
         get_jenkinsfile_path(job_url): Fetches the Jenkinsfile path from the job configuration.
         get_branch_specifier(job_url): Fetches the branch specifier from the job configuration.
+        parse_job_config_fields(root): Extracts all the configuration fields from a parsed configuration.
+        parse_pipeline_type(root), parse_scm_url(root), parse_jenkinsfile_path(root),
+        parse_branch_specifier(root): Extract the fields above from a parsed configuration.
 
     """
-    def __init__(self, jenkins_url, username, api_token):
+    def __init__(self, jenkins_url, username, api_token, max_connections=64):
         """
         Initialize JenkinsAPI with URL, username, and API token.
 
@@ -50,16 +107,26 @@ class JenkinsAPI:
             jenkins_url (str): The base URL of the Jenkins server.
             username (str): The username for authentication.
             api_token (str): The API token or password for authentication.
+            max_connections (int): The number of connections kept alive to Jenkins.
 
         """
         self.jenkins_url = jenkins_url
         self.username = username
         self.api_token = api_token
-        self.crumb = self.get_crumb()
+        self.session = create_session(
+            auth=(username, api_token), pool_maxsize=max_connections
+        )
 
-    def get_crumb(self):
+    @cached_property
+    def crumb(self):
         """
-        Fetch Jenkins crumb to prevent CSRF issues.
+        Jenkins crumb to prevent CSRF issues.
+
+        The crumb is only fetched on first access, and is then sent with every
+        subsequent request of the session. Jenkins only requires it for requests
+        that change data; the GET requests of this class do not need it and do
+        not access it, so unless `crumb` or `get_crumb` is used, no request
+        carries the crumb header.
 
         Returns:
             str: The Jenkins crumb.
@@ -75,38 +142,80 @@ class JenkinsAPI:
         print("[JenkinsAPI] Fetching Jenkins crumb...")
 
         # Send GET request to fetch the crumb
-        response = requests.get(
-            crumb_url, auth=(self.username, self.api_token), verify=False
-        )
+        response = self.session.get(crumb_url)
 
         # Check if the response is successful
         if response.status_code == 200:
             print("[JenkinsAPI] Successfully fetched crumb.")
-            return response.json()["crumb"]
+            crumb = response.json()["crumb"]
+            # Send the crumb with every subsequent request
+            self.session.headers.update({"Jenkins-Crumb": crumb})
+            return crumb
         else:
             raise Exception("Failed to fetch Jenkins crumb")
 
+    def get_crumb(self):
+        """
+        Fetch Jenkins crumb to prevent CSRF issues.
+
+        Returns:
+            str: The Jenkins crumb, fetched on the first call only.
+
+        """
+        return self.crumb
+
     def fetch_jobs(self, api_url, parent_path=""):
         """
         Recursively fetch all Jenkins jobs.
 
+        The API URL is expected to request `JOBS_TREE`, so that folders up to
+        `JOBS_TREE_DEPTH` levels deep come back in the same response. Only the
+        folders nested deeper than that are fetched with additional requests.
+
         Args:
             api_url (str): The Jenkins API URL to fetch jobs.
             parent_path (str): The hierarchical path of parent jobs (folders).
 
         Returns:
-            list of tuples: A list containing tuples of (job_name, current_path, job_url).
+            list of tuples: A list containing tuples of
+                (job_name, current_path, job_url, job_class).
 
         Jenkins API Endpoint Used:
-            - GET `/api/json?tree=jobs[name,url,jobs[name,url]]`
+            - GET `/api/json?tree=jobs[name,url,_class,jobs[...,jobs[name]]]`
+
+        Raises:
+            Exception: If the jobs cannot be fetched (e.g., wrong URL or credentials).
 
         """
         # Send GET request to fetch jobs
-        response = requests.get(
-            api_url, auth=(self.username, self.api_token), verify=False
-        )
-        jobs_data = response.json()
+        response = self.session.get(api_url)
+
+        # Check if the response is successful before decoding it; an error
+        # response is usually an HTML page
+        if response.status_code != 200:
+            raise Exception(
+                f"Failed to fetch Jenkins jobs - Request URL: {api_url}"
+                f" - Response Code: {response.status_code}"
+            )
+        jobs_data = orjson.loads(response.content)
         jobs = jobs_data.get("jobs", [])
+
+        return self._collect_jobs(jobs, parent_path, depth=1)
+
+    def _collect_jobs(self, jobs, parent_path, depth):
+        """
+        Flatten the jobs of a `JOBS_TREE` response.
+
+        Args:
+            jobs (list of dict): The jobs at the current level of the response.
+            parent_path (str): The hierarchical path of parent jobs (folders).
+            depth (int): The level of `jobs` in the response, starting at 1.
+
+        Returns:
+            list of tuples: A list containing tuples of
+                (job_name, current_path, job_url, job_class).
+
+        """
         all_jobs = []
 
         # Iterate over each job in the jobs list
@@ -120,16 +229,24 @@ class JenkinsAPI:
 
             # Check if the current job is a folder (has nested jobs)
             if "jobs" in job:
-                # Recursively fetch nested jobs
-                nested_api_url = (
-                    f"{job_url}api/json?tree=jobs[name,url,jobs[name,url]]"
-                )
-                all_jobs.extend(
-                    self.fetch_jobs(nested_api_url, current_path)
-                )
+                if depth < JOBS_TREE_DEPTH:
+                    # The nested jobs are in the response along with their
+                    # own nested jobs, so walk them without a new request
+                    all_jobs.extend(
+                        self._collect_jobs(job["jobs"], current_path, depth + 1)
+                    )
+                else:
+                    # The response only has the names of the nested jobs of
+                    # the innermost folders, so fetch these folders again
+                    nested_api_url = f"{job_url}api/json?tree={JOBS_TREE}"
+                    all_jobs.extend(
+                        self.fetch_jobs(nested_api_url, current_path)
+                    )
             else:
                 # Append job details for further processing
-                all_jobs.append((job_name, current_path, job_url))
+                all_jobs.append(
+                    (job_name, current_path, job_url, job.get("_class"))
+                )
 
         return all_jobs
 
@@ -141,7 +258,8 @@ class JenkinsAPI:
             job_url (str): The URL of the Jenkins job.
 
         Returns:
-            datetime or None: The datetime of the last run if available, else None.
+            int or None: The timestamp of the last run in milliseconds since the epoch
+                         if available, else None.
 
         Jenkins API Endpoint Used:
             - GET `/lastBuild/api/json`
@@ -150,31 +268,25 @@ class JenkinsAPI:
         last_build_url = f"{job_url}lastBuild/api/json"
 
         # Send GET request to fetch the last build data
-        response = requests.get(
-            last_build_url, auth=(self.username, self.api_token), verify=False
-        )
+        response = self.session.get(last_build_url)
 
         # Check if the response is successful
         if response.status_code == 200:
-            build_data = response.json()
-            # Extract the timestamp from the build data
-            if 'timestamp' in build_data:
-                timestamp_ms = build_data['timestamp']
-                # Convert the timestamp from milliseconds to datetime
-                last_run = datetime.fromtimestamp(timestamp_ms / 1000)
-                return last_run
+            build_data = orjson.loads(response.content)
+            # Extract the timestamp (in milliseconds) from the build data
+            return build_data.get('timestamp')
         return None
 
-    def get_pipeline_type(self, job_url):
+    def get_job_config(self, job_url):
         """
-        Determine the pipeline type of a Jenkins job by inspecting its config.
+        Fetch and parse the configuration XML of a Jenkins job.
 
         Args:
             job_url (str): The URL of the Jenkins job.
 
         Returns:
-            str: The pipeline type ('Pipeline Script', 'Pipeline Script from SCM',
-                 or 'Unknown or not a Pipeline job').
+            lxml.etree._Element or None: The root element of the job configuration,
+                                         or None if it cannot be fetched.
 
         Jenkins API Endpoint Used:
             - GET `/config.xml`
@@ -183,26 +295,47 @@ class JenkinsAPI:
         config_url = f"{job_url}config.xml"
 
         # Send GET request to fetch the job configuration XML
-        response = requests.get(
-            config_url, auth=(self.username, self.api_token), verify=False
-        )
+        response = self.session.get(config_url)
 
         # Check if the response is successful
         if response.status_code == 200:
-            config_xml = response.text
-            root = ET.fromstring(config_xml)
+            # Parse the raw bytes; lxml reads the encoding from the XML declaration
+            return etree.fromstring(response.content)
+        return None
 
-            # Check for Pipeline Script
-            if root.find(
-                ".//definition[@class='org.jenkinsci.plugins.workflow.cps.CpsFlowDefinition']"
-            ) is not None:
-                return "Pipeline Script"
-            # Check for Pipeline Script from SCM
-            elif root.find(
-                ".//definition[@class='org.jenkinsci.plugins.workflow.cps.CpsScmFlowDefinition']"
-            ) is not None:
-                return "Pipeline Script from SCM"
-        return "Unknown or not a Pipeline job"
+    def get_job_config_fields(self, job_url):
+        """
+        Fetch all the configuration fields of a job with a single request.
+
+        Args:
+            job_url (str): The URL of the Jenkins job.
+
+        Returns:
+            dict: A dictionary with the keys 'pipeline_type', 'scm_url',
+                  'jenkinsfile_path', and 'branch_specifier'.
+
+        Jenkins API Endpoint Used:
+            - GET `/config.xml`
+
+        """
+        return self.parse_job_config_fields(self.get_job_config(job_url))
+
+    def get_pipeline_type(self, job_url):
+        """
+        Determine the pipeline type of a Jenkins job by inspecting its config.
+
+        Args:
+            job_url (str): The URL of the Jenkins job.
+
+        Returns:
+            str: The pipeline type ('Pipeline Script', 'Pipeline Script from SCM',
+                 or 'Unknown or not a Pipeline job').
+
+        Jenkins API Endpoint Used:
+            - GET `/config.xml`
+
+        """
+        return self.parse_pipeline_type(self.get_job_config(job_url))
 
     def get_scm_url(self, job_url):
         """
@@ -218,27 +351,7 @@ class JenkinsAPI:
             - GET `/config.xml`
 
         """
-        config_url = f"{job_url}config.xml"
-
-        # Send GET request to fetch the job configuration XML
-        response = requests.get(
-            config_url, auth=(self.username, self.api_token), verify=False
-        )
-
-        # Check if the response is successful
-        if response.status_code == 200:
-            config_xml = response.text
-            root = ET.fromstring(config_xml)
-
-            # Find the SCM element
-            scm = root.find(".//scm[@class='hudson.plugins.git.GitSCM']")
-            if scm is not None:
-                user_remote_configs = scm.find("userRemoteConfigs")
-                if user_remote_configs is not None:
-                    url_element = user_remote_configs.find(".//url")
-                    if url_element is not None:
-                        return url_element.text
-        return "NA"
+        return self.parse_scm_url(self.get_job_config(job_url))
 
     def get_jenkinsfile_path(self, job_url):
         """
@@ -254,23 +367,7 @@ class JenkinsAPI:
             - GET `/config.xml`
 
         """
-        config_url = f"{job_url}config.xml"
-
-        # Send GET request to fetch the job configuration XML
-        response = requests.get(
-            config_url, auth=(self.username, self.api_token), verify=False
-        )
-
-        # Check if the response is successful
-        if response.status_code == 200:
-            config_xml = response.text
-            root = ET.fromstring(config_xml)
-
-            # Find the scriptPath element
-            script_path = root.find(".//definition/scriptPath")
-            if script_path is not None:
-                return script_path.text
-        return "NA"
+        return self.parse_jenkinsfile_path(self.get_job_config(job_url))
 
     def get_branch_specifier(self, job_url):
         """
@@ -286,25 +383,105 @@ class JenkinsAPI:
             - GET `/config.xml`
 
         """
-        config_url = f"{job_url}config.xml"
+        return self.parse_branch_specifier(self.get_job_config(job_url))
 
-        # Send GET request to fetch the job configuration XML
-        response = requests.get(
-            config_url, auth=(self.username, self.api_token), verify=False
-        )
+    @classmethod
+    def parse_job_config_fields(cls, root):
+        """
+        Extract all the configuration fields from a parsed job configuration.
 
-        # Check if the response is successful
-        if response.status_code == 200:
-            config_xml = response.text
-            root = ET.fromstring(config_xml)
+        Args:
+            root (lxml.etree._Element or None): The job configuration root; None
+                                                 gives the default value of each field.
 
-            # Find the branches element
-            branches = root.find(
-                ".//scm[@class='hudson.plugins.git.GitSCM']/branches"
-            )
-            if branches is not None:
-                branch_specifier = branches.find(".//name")
-                if branch_specifier is not None:
-                    return branch_specifier.text
+        Returns:
+            dict: A dictionary with the keys 'pipeline_type', 'scm_url',
+                  'jenkinsfile_path', and 'branch_specifier'.
+
+        """
+        return {
+            "pipeline_type": cls.parse_pipeline_type(root),
+            "scm_url": cls.parse_scm_url(root),
+            "jenkinsfile_path": cls.parse_jenkinsfile_path(root),
+            "branch_specifier": cls.parse_branch_specifier(root),
+        }
+
+    @staticmethod
+    def parse_pipeline_type(root):
+        """
+        Determine the pipeline type from a parsed job configuration.
+
+        Args:
+            root (lxml.etree._Element or None): The job configuration root.
+
+        Returns:
+            str: The pipeline type ('Pipeline Script', 'Pipeline Script from SCM',
+                 or 'Unknown or not a Pipeline job').
+
+        """
+        if root is not None:
+            # Check for Pipeline Script
+            if _XPATH_PIPELINE_SCRIPT(root):
+                return "Pipeline Script"
+            # Check for Pipeline Script from SCM
+            elif _XPATH_PIPELINE_SCRIPT_FROM_SCM(root):
+                return "Pipeline Script from SCM"
+        return "Unknown or not a Pipeline job"
+
+    @staticmethod
+    def parse_scm_url(root):
+        """
+        Extract the SCM URL from a parsed job configuration.
+
+        Args:
+            root (lxml.etree._Element or None): The job configuration root.
+
+        Returns:
+            str: The SCM URL (e.g., Git repository URL) if found, else 'NA'.
+
+        """
+        if root is not None:
+            # Find the url element of the first Git SCM remote
+            url_elements = _XPATH_SCM_URL(root)
+            if url_elements:
+                return url_elements[0].text
+        return "NA"
+
+    @staticmethod
+    def parse_jenkinsfile_path(root):
+        """
+        Extract the Jenkinsfile path from a parsed job configuration.
+
+        Args:
+            root (lxml.etree._Element or None): The job configuration root.
+
+        Returns:
+            str: The Jenkinsfile path if found, else 'NA'.
+
+        """
+        if root is not None:
+            # Find the scriptPath element
+            script_paths = _XPATH_JENKINSFILE_PATH(root)
+            if script_paths:
+                return script_paths[0].text
+        return "NA"
+
+    @staticmethod
+    def parse_branch_specifier(root):
+        """
+        Extract the branch specifier from a parsed job configuration.
+
+        Args:
+            root (lxml.etree._Element or None): The job configuration root.
+
+        Returns:
+            str: The branch specifier (e.g., 'master', '**'), default is '**'.
+
+        """
+        if root is not None:
+            # Find the name element of the first Git SCM branches
+            branch_specifiers = _XPATH_BRANCH_SPECIFIER(root)
+            if branch_specifiers:
+                return branch_specifiers[0].text
         # If branch specifier is not found, return "**" to indicate wildcard
         return "**"
@@ -2,121 +2,728 @@
 Logger utility module.
 
 This module provides utility functions to set up a logger for the application,
-including file logging with rotation and console logging.
+including buffered file logging with rotation and console logging.
+
+Classes:
+    CachedFormatter: A formatter that formats the time of the records once per second.
+    FixedFormatter: A CachedFormatter specialized for the application log format.
+    FastStreamHandler: A handler that writes the records straight to a file descriptor.
+    BufferedRotatingFileHandler: A rotating file handler that writes records in large chunks
+        and rotates the backups in the background.
 
 Functions:
-    setup_app_logger(logger_name, log_file_path): Sets up the application logger.
-    create_log_file(app_name, parent_dir_path): Creates a log file with a timestamped name.
-    get(app_name, enable_logs_file): Initializes and returns the logger.
+    create_file_handler(log_file_path, formatter, memory_buffered, buffer_size): Creates
+        the handler of the log file.
+    setup_app_logger(logger_name, log_file_path, memory_buffered, buffer_size): Sets up the application logger with
+        asynchronous handlers.
+    stop_listener(listener): Stops the listener and writes the records held in memory.
+    replace_file_handler(logger, log_file_path, memory_buffered, buffer_size): Replaces the
+        file handler of a configured logger.
+    create_log_file(app_name, parent_dir_path): Builds a timestamped log file path.
+    lazy_log(logger, level, msg, *args): Logs a message only if its level is enabled.
+    get(app_name, enable_logs_file, memory_buffered, buffer_size): Initializes and returns the logger, once per caller and arguments.
 
 """
 
+import io
 import os
 import sys
-import inspect
+import stat
+import time
+import queue
+import codecs
+import atexit
 import logging
-from datetime import datetime
-from logging.handlers import RotatingFileHandler
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import (
+    MemoryHandler, QueueHandler, QueueListener, RotatingFileHandler
+)
+
+# Default size in bytes of the write buffer of the log file
+FILE_BUFFER_SIZE = 64 * 1024
+
+# Loggers returned by `get`, keyed by their arguments and caller_abs_path
+_LOGGER_CACHE = {}
+
+
+class CachedFormatter(logging.Formatter):
+    """
+    Formatter that formats the time of the records only once per second.
+
+    All the records created within the same second share the same `asctime`,
+    so the formatted time is cached and reused until the second changes. The
+    cache is exact as long as the date format has no sub-second fields.
+
+    """
+    def __init__(self, *args, **kwargs):
+        """
+        Initialize the formatter with an empty time cache.
+
+        Args:
+            *args: Positional arguments passed to `logging.Formatter`.
+            **kwargs: Keyword arguments passed to `logging.Formatter`.
+
+        """
+        super().__init__(*args, **kwargs)
+        # Second and formatted time of the last formatted record
+        self._time_cache = (None, '')
+
+    def formatTime(self, record, datefmt=None):
+        """
+        Format the creation time of a record, reusing the last result within the same second.
+
+        Args:
+            record (logging.LogRecord): The log record.
+            datefmt (str or None): The date format; None uses the default format with msecs.
+
+        Returns:
+            str: The formatted creation time.
+
+        """
+        # The default format includes msecs, so it cannot be cached per second
+        if datefmt is None:
+            return super().formatTime(record, datefmt)
+
+        second = int(record.created)
+        cached_second, cached_time = self._time_cache
+        if second != cached_second:
+            cached_time = time.strftime(datefmt, self.converter(second))
+            self._time_cache = (second, cached_time)
+        return cached_time
+
+
+class FixedFormatter(CachedFormatter):
+    """
+    Formatter specialized for the 'asctime | levelname | name | message' format.
+
+    The line is built with a single f-string instead of interpolating the
+    `%`-style template with the record attributes for every record, and is
+    built only once per record even when several handlers share the formatter.
+
+    """
+    def __init__(self, datefmt='%Y-%m-%d %H:%M:%S'):
+        """
+        Initialize the formatter.
+
+        Args:
+            datefmt (str): The date format of `asctime`.
+
+        """
+        super().__init__(
+            '%(asctime)s | %(levelname)s | %(name)s | %(message)s', datefmt=datefmt
+        )
+
+    def format(self, record):
+        """
+        Format a record as 'asctime | levelname | name | message'.
+
+        Args:
+            record (logging.LogRecord): The log record.
+
+        Returns:
+            str: The formatted record, followed by the exception and stack information if any.
+
+        """
+        # The console and file handlers share this formatter, so reuse the line
+        # already formatted for the same record by the other handler
+        if record.__dict__.get('_formatted_by') is self:
+            return record._formatted
+
+        record.message = record.getMessage()
+        formatted = (
+            f"{self.formatTime(record, self.datefmt)} | {record.levelname} | "
+            f"{record.name} | {record.message}"
+        )
+
+        # Append the exception and stack information the same way as `logging.Formatter`
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            if formatted[-1:] != "\n":
+                formatted += "\n"
+            formatted += record.exc_text
+        if record.stack_info:
+            if formatted[-1:] != "\n":
+                formatted += "\n"
+            formatted += self.formatStack(record.stack_info)
+
+        # Cache the formatted line on the record
+        record._formatted_by = self
+        record._formatted = formatted
+        return formatted
+
+
+class FastStreamHandler(logging.Handler):
+    """
+    Handler that writes the encoded records straight to a file descriptor.
+
+    Unlike `logging.StreamHandler(sys.stdout)`, the records skip the text
+    layer of `sys.stdout` and are not followed by a flush, so each record
+    usually costs a single `os.write` call. The line and its newline are
+    assembled in a buffer that is reused across records.
+
+    Output that is still pending in the Python stream of the same file
+    descriptor (e.g. from `print`) is flushed first, so that it stays in order
+    with the records. The records are encoded the same way as that stream.
+
+    Attributes:
+        fd (int): The file descriptor the records are written to.
+        stream (io.TextIOBase or None): The Python stream of the file descriptor, if any.
+        encoding (str): The encoding of the records; the one of `stream`, or UTF-8.
+        errors (str): The encoding error handler; the one of `stream`, or 'strict'.
+
+    """
+    # Buffers grown beyond this size by a large record are not kept for reuse
+    max_buffer_size = 64 * 1024
+
+    def __init__(self, fd=1, stream=None):
+        """
+        Initialize the handler.
+
+        Args:
+            fd (int): The file descriptor to write to; defaults to stdout.
+            stream (io.TextIOBase or None): The Python stream of the file descriptor,
+                flushed before each record.
+
+        """
+        super().__init__()
+        self.fd = fd
+        self.stream = stream
+        self.encoding = getattr(stream, 'encoding', None) or 'utf-8'
+        self.errors = getattr(stream, 'errors', None) or 'strict'
+
+        # Records are emitted under the handler lock, so one buffer is enough
+        self._buffer = bytearray()
+
+    def emit(self, record):
+        """
+        Format, encode and write a record to the file descriptor.
+
+        Args:
+            record (logging.LogRecord): The log record.
+
+        """
+        buffer = self._buffer
+        try:
+            buffer += self.format(record).encode(self.encoding, self.errors)
+            buffer.append(0x0A)
+
+            # Write the pending output of the Python stream first
+            if self.stream is not None:
+                self.stream.flush()
+
+            # A single write may be partial on pipes, so write until all is written
+            written = os.write(self.fd, buffer)
+            while written < len(buffer):
+                written += os.write(self.fd, buffer[written:])
+        except Exception:
+            self.handleError(record)
+        finally:
+            # Empty the buffer, or drop it if a large record grew it too much
+            if len(buffer) > self.max_buffer_size:
+                self._buffer = bytearray()
+            else:
+                buffer.clear()
+
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """
+    Rotating file handler that buffers records instead of flushing each one.
+
+    Records are encoded by the handler itself and collected in the write
+    buffer of a binary file, without a text layer in between, and reach the
+    file in chunks of `buffer_size` bytes, or at the latest every
+    `flush_interval` seconds, on rollover, and on close. The size of the log
+    file is tracked by counting the written bytes, so deciding on a rollover
+    neither seeks nor flushes the stream.
+
+    On rollover, only the full log file is renamed before a new one is opened;
+    the renaming of the backup files runs in a background worker thread, so
+    that the records keep being written while the backups are rotated.
+
+    Attributes:
+        buffer_size (int): The size of the write buffer in bytes.
+        flush_interval (float): The maximum time in seconds a record stays in the buffer.
+
+    """
+    # The records are written as bytes, so the terminator is bytes as well
+    terminator = b'\n'
+
+    def __init__(self, *args, buffer_size=FILE_BUFFER_SIZE, flush_interval=0.1, **kwargs):
+        """
+        Initialize the handler and start the periodic flush thread.
+
+        Args:
+            *args: Positional arguments passed to `RotatingFileHandler`.
+            buffer_size (int): The size of the write buffer in bytes.
+            flush_interval (float): The maximum time in seconds a record stays in the buffer.
+            **kwargs: Keyword arguments passed to `RotatingFileHandler`.
+
+        """
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        super().__init__(*args, **kwargs)
+
+        # The file is written in binary mode, so look up the encoder only once
+        self._encode = codecs.lookup(self.encoding or 'utf-8').encode
+        # `FileHandler.errors` only exists from Python 3.9
+        self._errors = getattr(self, 'errors', None) or 'strict'
+
+        # Flush the buffer periodically from a background thread
+        self._stop_event = threading.Event()
+        self._flush_thread = threading.Thread(
+            target=self._flush_periodically, daemon=True
+        )
+        self._flush_thread.start()
+
+        # Rotate the backup files in a single background worker thread
+        self._rollover_executor = ThreadPoolExecutor(max_workers=1)
+        self._rollover_count = 0
+
+        # Make sure the buffered records are written on exit
+        atexit.register(self.flush_buffer)
+
+    def _open(self):
+        """
+        Open the log file for binary appends with a write buffer of `buffer_size` bytes.
+
+        Returns:
+            io.BufferedWriter: The opened file stream.
+
+        """
+        raw_file = io.FileIO(self.baseFilename, 'ab')
+
+        # Start counting the written bytes from the current size of the file;
+        # only regular files are rolled over, like in `RotatingFileHandler`
+        file_stat = os.fstat(raw_file.fileno())
+        self._rollover_enabled = stat.S_ISREG(file_stat.st_mode)
+        self._bytes_written = file_stat.st_size
+
+        return io.BufferedWriter(raw_file, buffer_size=self.buffer_size)
+
+    def _exceeds_max_bytes(self, size):
+        """
+        Check if writing a number of bytes would take the log file to `maxBytes`.
+
+        Args:
+            size (int): The number of bytes to write.
+
+        Returns:
+            bool: True if the log file should be rolled over first.
+
+        """
+        return (
+            self.maxBytes > 0 and self._rollover_enabled and self._bytes_written > 0
+            and self._bytes_written + size >= self.maxBytes
+        )
+
+    def shouldRollover(self, record):
+        """
+        Check if writing a record would take the log file to `maxBytes`.
+
+        Uses the count of the written bytes instead of seeking the stream.
+
+        Args:
+            record (logging.LogRecord): The log record.
+
+        Returns:
+            bool: True if the log file should be rolled over first.
+
+        """
+        if self.stream is None:
+            self.stream = self._open()
+        data = self._encode(self.format(record), self._errors)[0]
+        return self._exceeds_max_bytes(len(data) + len(self.terminator))
+
+    def emit(self, record):
+        """
+        Format a record, encode it with the pre-bound encoder and write it to the buffer.
+
+        Args:
+            record (logging.LogRecord): The log record.
+
+        """
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            data = self._encode(self.format(record), self._errors)[0]
+            size = len(data) + len(self.terminator)
+            if self._exceeds_max_bytes(size):
+                self.doRollover()
+                if self.stream is None:
+                    self.stream = self._open()
+            self.stream.write(data)
+            self.stream.write(self.terminator)
+            self._bytes_written += size
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        """
+        Do not flush after each record; see `flush_buffer`.
+        """
+
+    def doRollover(self):
+        """
+        Move the full log file aside, open a new one, and rotate the backups in the background.
+
+        Called under the handler lock, so no record is written while the stream is swapped.
+        """
+        # Close the full log file, which writes its buffer
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+        if self.backupCount > 0:
+            # Move the full log file to a unique pending name, freeing the log file name
+            self._rollover_count += 1
+            pending_name = f"{self.baseFilename}.rollover-{self._rollover_count}"
+            os.replace(self.baseFilename, pending_name)
+
+            # Rename the backup files in the worker thread
+            try:
+                self._rollover_executor.submit(self._rotate_backups, pending_name)
+            except RuntimeError:
+                # The executor does not accept work during interpreter shutdown
+                self._rotate_backups(pending_name)
+
+        # Open the new log file right away
+        if not self.delay:
+            self.stream = self._open()
+
+    def _rotate_backups(self, pending_name):
+        """
+        Shift the backup files by one and make the pending file the first backup.
+
+        Args:
+            pending_name (str): The name the full log file was moved to on rollover.
+
+        """
+        # Shift the existing backups: .1 -> .2, ..., dropping the oldest one
+        for i in range(self.backupCount - 1, 0, -1):
+            source_name = self.rotation_filename(f"{self.baseFilename}.{i}")
+            dest_name = self.rotation_filename(f"{self.baseFilename}.{i + 1}")
+            if os.path.exists(source_name):
+                os.replace(source_name, dest_name)
+
+        # Make the full log file the first backup
+        self.rotate(pending_name, self.rotation_filename(f"{self.baseFilename}.1"))
+
+    def flush_buffer(self):
+        """
+        Write the buffered records to the log file.
+        """
+        self.acquire()
+        try:
+            if self.stream and not self.stream.closed:
+                self.stream.flush()
+        finally:
+            self.release()
+
+    def _flush_periodically(self):
+        """
+        Flush the buffer every `flush_interval` seconds until the handler is closed.
+        """
+        while not self._stop_event.wait(self.flush_interval):
+            self.flush_buffer()
+
+    def close(self):
+        """
+        Stop the periodic flush thread, flush and close the log file, and wait for
+        the pending backup rotations.
+        """
+        # The handler is flushed here, so it no longer needs to be flushed at exit,
+        # and must not be kept alive until then
+        atexit.unregister(self.flush_buffer)
+        self._stop_event.set()
+        self.flush_buffer()
+        super().close()
+        self._rollover_executor.shutdown(wait=True)
+
+
+def lazy_log(logger, level, msg, *args):
+    """
+    Log a message only if the logger is enabled for its level.
+
+    The message is a `%`-style template merged with `args` only when a record
+    is actually emitted, e.g. `lazy_log(log, logging.DEBUG, 'Job: %s', job)`,
+    so filtered-out messages cost no string formatting.
+
+    Args:
+        logger (logging.Logger): The logger to log with.
+        level (int): The logging level of the message.
+        msg (str): The `%`-style message template.
+        *args: The arguments merged into the message template.
+
+    """
+    if logger.isEnabledFor(level):
+        # Report the caller of this helper as the origin of the record
+        logger._log(level, msg, args, stacklevel=2)
+
+
+def create_file_handler(log_file_path, formatter, memory_buffered=False,
+                        buffer_size=FILE_BUFFER_SIZE):
+    """
+    Create the rotating handler that writes the records to the log file.
+
+    Args:
+        log_file_path (str): The file path to save logs.
+        formatter (logging.Formatter): The formatter of the records.
+        memory_buffered (bool): Flag to keep the records in memory and write them
+            all at once on exit or on the first error.
+        buffer_size (int): The size of the write buffer of the log file in bytes.
 
+    Returns:
+        logging.Handler: The file handler, wrapped in a `MemoryHandler` if memory buffered.
 
-def setup_app_logger(logger_name, log_file_path=None):
+    """
+    # Set up a BufferedRotatingFileHandler to write logs to the file
+    file_handler = BufferedRotatingFileHandler(
+        filename=log_file_path, mode='a', maxBytes=5 * 1024 * 1024,
+        backupCount=100, encoding='utf8', delay=False, buffer_size=buffer_size
+    )
+    file_handler.setFormatter(formatter)
+
+    # Call the formatter directly instead of through `Handler.format`
+    file_handler.format = formatter.format
+
+    # For short runs, hold up to 10000 records in memory and write them in one go
+    if memory_buffered:
+        memory_handler = MemoryHandler(
+            capacity=10000, flushLevel=logging.ERROR, target=file_handler,
+            flushOnClose=True
+        )
+        return memory_handler
+
+    return file_handler
+
+
+def setup_app_logger(logger_name, log_file_path=None, memory_buffered=False,
+                     buffer_size=FILE_BUFFER_SIZE):
     """
     Set up the application logger with console and optional file handlers.
 
+    The logger itself only puts the records on a queue; a background listener
+    thread takes them off the queue and passes them to the console and file
+    handlers, so that logging never waits on the console or the disk.
+
+    A logger that is already set up keeps its queue, listener and console
+    handler; only the file handler is replaced if the log file settings changed.
+
     Args:
         logger_name (str): The name of the logger.
         log_file_path (str or None): The file path to save logs, or None to disable file logging.
+        memory_buffered (bool): Flag to hold the file records in memory until exit,
+            suited to short runs.
+        buffer_size (int): The size of the write buffer of the log file in bytes; larger
+            buffers mean fewer writes for high-volume runs.
 
     Returns:
         logging.Logger: The configured logger instance.
 
     """
+    # Skip collecting the process, thread and task details of the records, which
+    # the log format does not use (these are global `logging` settings)
+    logging.logProcesses = False
+    logging.logThreads = False
+    logging.logMultiprocessing = False
+    logging.logAsyncioTasks = False
+
     # Create a logger
     logger = logging.getLogger(logger_name)
 
+    # Reuse the setup of a logger that is already configured
+    if getattr(logger, '_configured', False):
+        if (log_file_path, memory_buffered, buffer_size) != logger._file_settings:
+            replace_file_handler(logger, log_file_path, memory_buffered, buffer_size)
+        return logger
+
     # Set the level of logging
     logger.setLevel(logging.INFO)
 
     # Set the format of the log message
-    formatter = logging.Formatter(
-        '%(asctime)s | %(levelname)s | %(name)s | %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
+    # ('%(asctime)s | %(levelname)s | %(name)s | %(message)s')
+    formatter = FixedFormatter(datefmt='%Y-%m-%d %H:%M:%S')
 
     # Set up the console log handler (stdout)
-    log_handler = logging.StreamHandler(sys.stdout)
+    try:
+        # The Windows console decodes the bytes written to its file descriptor
+        # with its own code page, so only the Python stream writes to it correctly
+        if os.name == 'nt' and sys.stdout.isatty():
+            raise io.UnsupportedOperation('Windows console')
+        log_handler = FastStreamHandler(fd=sys.stdout.fileno(), stream=sys.stdout)
+    except (AttributeError, ValueError, OSError):
+        # stdout has no file descriptor (None, captured, or redirected to memory),
+        # or is a Windows console
+        log_handler = logging.StreamHandler(sys.stdout)
     log_handler.setFormatter(formatter)
-
-    # Clear any previous handlers and add the console handler
-    logger.handlers.clear()
-    logger.addHandler(log_handler)
+    log_handler.format = formatter.format
+    handlers = [log_handler]
 
     # If a log file path is provided, set up file logging
     if log_file_path:
-        # Set up a RotatingFileHandler to write logs to the file
-        file_handler = RotatingFileHandler(
-            filename=log_file_path, mode='a', maxBytes=5 * 1024 * 1024,
-            backupCount=100, encoding='utf8', delay=False
+        handlers.append(
+            create_file_handler(log_file_path, formatter, memory_buffered, buffer_size)
         )
-        file_handler.setFormatter(formatter)
-        # Add the file handler to the logger
-        logger.addHandler(file_handler)
+
+    # Run the handlers in a background listener thread fed by a queue; a
+    # SimpleQueue has no task tracking (task_done/join), which the listener
+    # does not need, and makes the put on the logging side cheaper
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+
+    # Clear any previous handlers and add the queue handler
+    logger.handlers.clear()
+    logger.addHandler(QueueHandler(log_queue))
+
+    # Start the listener, and stop it on exit once the queue is drained
+    listener.start()
+    atexit.register(stop_listener, listener)
+
+    # Keep the listener and the file settings on the logger, and mark it as configured
+    logger._listener = listener
+    logger._file_settings = (log_file_path, memory_buffered, buffer_size)
+    logger._configured = True
 
     # Return the configured logger
     return logger
 
 
+def stop_listener(listener):
+    """
+    Stop a listener once its queue is drained, then write the records held in memory.
+
+    Args:
+        listener (logging.handlers.QueueListener): The listener of the application logger.
+
+    """
+    listener.stop()
+
+    # The memory handlers only receive the last records once the queue is drained
+    for handler in listener.handlers:
+        if isinstance(handler, MemoryHandler):
+            handler.close()
+
+
+def replace_file_handler(logger, log_file_path, memory_buffered=False,
+                         buffer_size=FILE_BUFFER_SIZE):
+    """
+    Replace the file handler of a configured logger, keeping its other handlers.
+
+    Args:
+        logger (logging.Logger): The logger configured by `setup_app_logger`.
+        log_file_path (str or None): The new file path to save logs, or None to disable file logging.
+        memory_buffered (bool): Flag to hold the new file records in memory until exit.
+        buffer_size (int): The size of the write buffer of the new log file in bytes.
+
+    """
+    listener = logger._listener
+
+    # Stop the listener, so that the queued records are written with the current handlers
+    listener.stop()
+
+    # Close the current file handler and keep the others
+    handlers = []
+    for handler in listener.handlers:
+        if isinstance(handler, MemoryHandler):
+            # Write the records held in memory before closing the file
+            file_handler = handler.target
+            handler.close()
+            file_handler.close()
+        elif isinstance(handler, BufferedRotatingFileHandler):
+            handler.close()
+        else:
+            handlers.append(handler)
+
+    # Set up the new file handler with the formatter of the console handler
+    if log_file_path:
+        handlers.append(
+            create_file_handler(
+                log_file_path, handlers[0].formatter, memory_buffered, buffer_size
+            )
+        )
+
+    # Restart the listener with the new handlers
+    listener.handlers = tuple(handlers)
+    listener.start()
+    logger._file_settings = (log_file_path, memory_buffered, buffer_size)
+
+
 def create_log_file(app_name, parent_dir_path):
     """
-    Create a log file with a timestamped name in the logs directory.
+    Create the logs directory and build a timestamped log file path in it.
+
+    The log file itself is created by the file handler when it opens it.
 
     Args:
         app_name (str): The name of the application or log file prefix.
         parent_dir_path (str): The parent directory where logs directory will be created.
 
     Returns:
-        str: The full path to the created log file.
+        str: The full path to the log file.
 
     """
     # Create logs folder if it does not exist
     logs_folder_path = os.path.join(parent_dir_path, 'logs')
-    if not os.path.exists(logs_folder_path):
-        os.makedirs(logs_folder_path)
+    os.makedirs(logs_folder_path, exist_ok=True)
 
     # Get current timestamp in specific format
-    current_timestamp = datetime.now().strftime("%Y-%m-%d__%H-%M-%S")
+    current_timestamp = time.strftime("%Y-%m-%d__%H-%M-%S")
 
     # Construct the log file name
     logs_file_name = f"{app_name}__{current_timestamp}.log"
 
     # Full path to the log file
-    logs_file_path = os.path.join(logs_folder_path, logs_file_name)
+    return os.path.join(logs_folder_path, logs_file_name)
 
-    # Create the log file if it does not exist
-    if not os.path.exists(logs_file_path):
-        open(logs_file_path, 'w').close()
 
-    return logs_file_path
+@functools.lru_cache(maxsize=None)
+def _repo_root_for(caller_path):
+    """
+    Get the repo directory of a caller module, assumed to be two levels above it.
+
+    Args:
+        caller_path (str): The absolute path of the caller module.
 
+    Returns:
+        str: The absolute path of the repo directory.
 
-def get(app_name='logs', enable_logs_file=True):
+    """
+    return os.path.dirname(os.path.dirname(caller_path))
+
+
+def get(app_name='logs', enable_logs_file=True, memory_buffered=False,
+        buffer_size=FILE_BUFFER_SIZE):
     """
     Initialize and return the application logger.
 
+    Repeated calls with the same arguments from the same module return the
+    already configured logger instead of setting it up again.
+
     Args:
         app_name (str): The name of the application or log file prefix.
         enable_logs_file (bool): Flag to enable or disable file logging.
+        memory_buffered (bool): Flag to hold the file records in memory and write them
+            at once on exit or on the first error, suited to short runs.
+        buffer_size (int): The size of the write buffer of the log file in bytes.
 
     Returns:
         logging.Logger: The configured logger instance.
 
     """
-    if enable_logs_file:
-        # Get the absolute path of the caller module
-        caller_abs_path = inspect.stack()[1].filename
+    # Get the absolute path of the caller module
+    caller_abs_path = sys._getframe(1).f_code.co_filename
+
+    # Return the logger of an identical previous call without setting it up again
+    cache_key = (app_name, enable_logs_file, memory_buffered, buffer_size, caller_abs_path)
+    if cache_key in _LOGGER_CACHE:
+        return _LOGGER_CACHE[cache_key]
 
+    if enable_logs_file:
         # Get the absolute path of the parent directory (assumed repo directory)
-        repo_abs_path = os.path.dirname(os.path.dirname(caller_abs_path))
+        repo_abs_path = _repo_root_for(caller_abs_path)
 
         # Create the log file
         logs_file_path = create_log_file(
@@ -124,10 +731,17 @@ def get(app_name='logs', enable_logs_file=True):
         )
 
         # Set up the logger with file logging
-        logger = setup_app_logger(logger_name='', log_file_path=logs_file_path)
+        logger = setup_app_logger(
+            logger_name='', log_file_path=logs_file_path,
+            memory_buffered=memory_buffered, buffer_size=buffer_size
+        )
     else:
         # Set up the logger without file logging
         logger = setup_app_logger(logger_name='', log_file_path=None)
 
+    # All the calls set up the same root logger, so only the latest setup is cached
+    _LOGGER_CACHE.clear()
+    _LOGGER_CACHE[cache_key] = logger
+
     # Return the logger
     return logger
@@ -0,0 +1,18 @@
+"""
+Pytest configuration.
+
+Puts the application directory on the import path, so that the tests import
+the packages the same way the application does (`from packages.x import y`).
+
+"""
+
+import os
+import sys
+
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        'pipelines_consolidator_for_modular_architecture'
+    )
+)
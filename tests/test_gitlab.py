@@ -0,0 +1,150 @@
+"""
+Tests for the GraphQL Jenkinsfile fetching of the gitlab package.
+"""
+
+import json
+
+import orjson
+
+from packages.gitlab.gitlab_api import GitLabAPI, GITLAB_URL
+
+
+class FakeResponse:
+    """
+    Minimal response with a status code and a raw body.
+    """
+    def __init__(self, status_code, content):
+        self.status_code = status_code
+        self.content = content
+
+
+class FakeSession:
+    """
+    Session that records the GraphQL requests and answers with canned responses.
+    """
+    def __init__(self, post_response, get_response=None):
+        self.post_response = post_response
+        self.get_response = get_response
+        self.posts = []
+        self.gets = []
+
+    def post(self, url, json=None):
+        self.posts.append((url, json))
+        return self.post_response
+
+    def get(self, url):
+        self.gets.append(url)
+        return self.get_response
+
+
+def make_api(session, graphql_batch_size=20):
+    """
+    Build a GitLabAPI client that uses a fake session.
+    """
+    api = GitLabAPI("token", max_connections=4, graphql_batch_size=graphql_batch_size)
+    api.session = session
+    return api
+
+
+def graphql_response(data):
+    """
+    Build a successful GraphQL response with the given data.
+    """
+    return FakeResponse(200, json.dumps({"data": data}).encode())
+
+
+JENKINSFILE_REQUESTS = [
+    (f"{GITLAB_URL}/group/project-a.git", "Jenkinsfile", "**", "job-a"),
+    (f"{GITLAB_URL}/group/missing", "Jenkinsfile", "*/develop", "job-b"),
+    ("NA", "NA", "**", "job-c"),
+    (f"{GITLAB_URL}/group/project-d.git", "ci/Jenkinsfile", "*/release", "job-d"),
+]
+
+
+def test_query_and_variables():
+    session = FakeSession(graphql_response({"j0": None}))
+    make_api(session).batch_get_jenkinsfiles(JENKINSFILE_REQUESTS)
+
+    # One request for the three jobs with a repository
+    (url, body), = session.posts
+    assert url == f"{GITLAB_URL}/api/graphql"
+    assert body["variables"] == {
+        "project0": "group/project-a", "path0": "Jenkinsfile",
+        "ref0_0": "main", "ref0_1": "master",
+        "project1": "group/missing", "path1": "Jenkinsfile", "ref1_0": "develop",
+        "project2": "group/project-d", "path2": "ci/Jenkinsfile", "ref2_0": "release",
+    }
+    query = body["query"]
+    assert "$project0: ID!, $path0: String!, $ref0_0: String!, $ref0_1: String!" in query
+    assert "j0: project(fullPath: $project0)" in query
+    assert "b1: blobs(paths: [$path0], ref: $ref0_1) { nodes { rawBlob } }" in query
+    assert "j2: project(fullPath: $project2)" in query
+    assert "j3" not in query
+
+
+def test_results_are_mapped_back_to_the_requests():
+    session = FakeSession(graphql_response({
+        # The Jenkinsfile of the first branch that has it wins
+        "j0": {"repository": {
+            "b0": {"nodes": []},
+            "b1": {"nodes": [{"rawBlob": "from master"}]},
+        }},
+        "j1": None,
+        "j2": {"repository": {"b0": {"nodes": []}}},
+    }))
+    results = make_api(session).batch_get_jenkinsfiles(JENKINSFILE_REQUESTS)
+
+    assert results == [
+        "from master", "Project Not Found", None, "Jenkinsfile Not Found"
+    ]
+
+
+def test_first_branch_wins():
+    session = FakeSession(graphql_response({
+        "j0": {"repository": {
+            "b0": {"nodes": [{"rawBlob": "from main"}]},
+            "b1": {"nodes": [{"rawBlob": "from master"}]},
+        }},
+    }))
+    results = make_api(session).batch_get_jenkinsfiles(JENKINSFILE_REQUESTS[:1])
+
+    assert results == ["from main"]
+
+
+def test_requests_are_split_into_batches():
+    session = FakeSession(graphql_response({"j0": None}))
+    make_api(session, graphql_batch_size=2).batch_get_jenkinsfiles(JENKINSFILE_REQUESTS)
+
+    assert [len(body["variables"]) for _, body in session.posts] == [7, 3]
+
+
+def test_failed_request_falls_back_to_rest():
+    session = FakeSession(
+        FakeResponse(502, b"Bad Gateway"), FakeResponse(200, b"pipeline {}")
+    )
+    results = make_api(session).batch_get_jenkinsfiles(JENKINSFILE_REQUESTS)
+
+    # Each Jenkinsfile is fetched from its first branch
+    assert results == [b"pipeline {}", b"pipeline {}", None, b"pipeline {}"]
+    assert len(session.gets) == 3
+
+
+def test_non_json_response_falls_back_to_rest():
+    session = FakeSession(
+        FakeResponse(200, b"<html>Sign in</html>"), FakeResponse(200, b"pipeline {}")
+    )
+    results = make_api(session).batch_get_jenkinsfiles(JENKINSFILE_REQUESTS)
+
+    assert results == [b"pipeline {}", b"pipeline {}", None, b"pipeline {}"]
+
+
+def test_graphql_errors_fall_back_to_rest():
+    session = FakeSession(
+        FakeResponse(200, orjson.dumps({"errors": [{"message": "Query too complex"}]})),
+        FakeResponse(404, b'{"message":"404 File Not Found"}')
+    )
+    results = make_api(session).batch_get_jenkinsfiles(JENKINSFILE_REQUESTS)
+
+    assert results == [
+        "Jenkinsfile Not Found", "Jenkinsfile Not Found", None, "Jenkinsfile Not Found"
+    ]
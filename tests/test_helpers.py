@@ -0,0 +1,84 @@
+"""
+Tests for the helpers package.
+"""
+
+import sqlite3
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from packages.helpers.helpers import create_session
+
+
+class JenkinsfileHandler(BaseHTTPRequestHandler):
+    """
+    Serve the same Jenkinsfile for every GET request.
+    """
+    def do_GET(self):
+        body = b"pipeline {}\n"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class UnavailableHandler(BaseHTTPRequestHandler):
+    """
+    Answer every GET request with 503 Service Unavailable.
+    """
+    requests_count = 0
+
+    def do_GET(self):
+        UnavailableHandler.requests_count += 1
+        self.send_response(503)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def test_gateway_errors_return_the_last_response(tmp_path):
+    server = HTTPServer(("127.0.0.1", 0), UnavailableHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        session = create_session(cache_name=str(tmp_path / "http_cache"))
+        response = session.get(f"http://127.0.0.1:{server.server_port}/job/a/config.xml")
+        session.close()
+    finally:
+        server.shutdown()
+
+    # The request is retried 3 times, then the 503 response is returned
+    assert response.status_code == 503
+    assert UnavailableHandler.requests_count == 4
+
+
+def test_cache_does_not_store_credentials(tmp_path):
+    server = HTTPServer(("127.0.0.1", 0), JenkinsfileHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    cache_name = str(tmp_path / "http_cache")
+    try:
+        session = create_session(
+            auth=("jenkins-user", "jenkins-secret"),
+            headers={"Private-Token": "gitlab-secret"}, cache_name=cache_name
+        )
+        url = (
+            f"http://127.0.0.1:{server.server_port}"
+            "/api/v4/projects/group%2Fproject/repository/files/Jenkinsfile/raw?ref=main"
+        )
+        assert session.get(url).status_code == 200
+        assert session.get(url).from_cache
+        session.close()
+    finally:
+        server.shutdown()
+
+    # The cached request must not contain the secrets
+    with sqlite3.connect(f"{cache_name}.sqlite") as connection:
+        rows = connection.execute("SELECT value FROM responses").fetchall()
+    assert rows
+    for (value,) in rows:
+        assert b"gitlab-secret" not in bytes(value)
+        assert b"jenkins-secret" not in bytes(value)
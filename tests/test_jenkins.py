@@ -0,0 +1,161 @@
+"""
+Tests for the job fetching of the jenkins package.
+"""
+
+import orjson
+import pytest
+
+from packages.jenkins.jenkins_api import JenkinsAPI, JOBS_TREE, JOBS_TREE_DEPTH
+
+JENKINS_URL = "https://jenkins.example.com"
+
+
+class FakeResponse:
+    """
+    Minimal response with a status code and a raw body.
+    """
+    def __init__(self, status_code, content):
+        self.status_code = status_code
+        self.content = content
+
+
+class FakeSession:
+    """
+    Session that records the requests and answers them with a handler.
+    """
+    def __init__(self, handler):
+        self.handler = handler
+        self.gets = []
+
+    def get(self, url):
+        self.gets.append(url)
+        return self.handler(url)
+
+
+def make_api(session):
+    """
+    Build a JenkinsAPI client that uses a fake session.
+    """
+    api = JenkinsAPI(JENKINS_URL, "user", "token", max_connections=4)
+    api.session = session
+    return api
+
+
+def test_fetch_jobs_fails_clearly_on_error_response():
+    # Jenkins answers wrong credentials with an HTML page, not with JSON
+    session = FakeSession(lambda url: FakeResponse(401, b"<html>Unauthorized</html>"))
+    api = make_api(session)
+
+    with pytest.raises(Exception, match="Failed to fetch Jenkins jobs.*401"):
+        api.fetch_jobs(f"{api.jenkins_url}/api/json?tree={JOBS_TREE}")
+
+    # The crumb is not fetched by the read-only requests
+    assert len(session.gets) == 1
+
+
+def job(name, url):
+    """
+    Build a job of the fake Jenkins server.
+    """
+    return {"name": name, "url": f"{url}{name}/", "_class": "WorkflowJob"}
+
+
+def folder(name, url, children):
+    """
+    Build a folder of the fake Jenkins server; `children` builds its jobs from its URL.
+    """
+    folder_url = f"{url}{name}/"
+    return {
+        "name": name, "url": folder_url, "_class": "Folder",
+        "jobs": children(folder_url),
+    }
+
+
+# Folders nested five levels deep, with a job at each level and an empty folder
+ROOT = {
+    "url": f"{JENKINS_URL}/",
+    "jobs": [
+        job("job-1", f"{JENKINS_URL}/"),
+        folder("empty", f"{JENKINS_URL}/", lambda url: []),
+        folder("level-1", f"{JENKINS_URL}/", lambda url: [
+            job("job-2", url),
+            folder("level-2", url, lambda url: [
+                job("job-3", url),
+                folder("level-3", url, lambda url: [
+                    job("job-4", url),
+                    folder("level-4", url, lambda url: [
+                        job("job-5", url),
+                        folder("level-5", url, lambda url: [
+                            job("job-6", url),
+                        ]),
+                    ]),
+                ]),
+            ]),
+        ]),
+    ],
+}
+
+
+def find_node(node, url):
+    """
+    Find the node of the fake Jenkins server with the given URL.
+    """
+    if node["url"] == url:
+        return node
+    for child in node.get("jobs", []):
+        found = find_node(child, url)
+        if found is not None:
+            return found
+    return None
+
+
+def render_jobs(node, depth=1):
+    """
+    Render the nested jobs of a node as Jenkins does for the `JOBS_TREE` query.
+    """
+    rendered = []
+    for child in node["jobs"]:
+        item = {key: child[key] for key in ("name", "url", "_class")}
+        if "jobs" in child:
+            if depth < JOBS_TREE_DEPTH:
+                item["jobs"] = render_jobs(child, depth + 1)
+            else:
+                # The innermost level only has the names of the nested jobs
+                item["jobs"] = [{"name": nested["name"]} for nested in child["jobs"]]
+        rendered.append(item)
+    return rendered
+
+
+def fake_jenkins(url):
+    """
+    Answer a `JOBS_TREE` request of the fake Jenkins server.
+    """
+    base_url, tree = url.split("api/json?tree=")
+    assert tree == JOBS_TREE
+    node = find_node(ROOT, base_url)
+    return FakeResponse(200, orjson.dumps({"jobs": render_jobs(node)}))
+
+
+def test_fetch_jobs_walks_nested_folders():
+    session = FakeSession(fake_jenkins)
+    api = make_api(session)
+
+    jobs = api.fetch_jobs(f"{JENKINS_URL}/api/json?tree={JOBS_TREE}")
+
+    assert [(job_name, current_path) for job_name, current_path, _, _ in jobs] == [
+        ("job-1", "job-1"),
+        ("job-2", "level-1 -> job-2"),
+        ("job-3", "level-1 -> level-2 -> job-3"),
+        ("job-4", "level-1 -> level-2 -> level-3 -> job-4"),
+        ("job-5", "level-1 -> level-2 -> level-3 -> level-4 -> job-5"),
+        ("job-6", "level-1 -> level-2 -> level-3 -> level-4 -> level-5 -> job-6"),
+    ]
+    assert jobs[-1][2] == f"{JENKINS_URL}/level-1/level-2/level-3/level-4/level-5/job-6/"
+
+    # The folders down to the fourth level come with the first response; only
+    # the fourth-level folder is fetched again for its nested jobs, which include
+    # the fifth-level folder. The empty folder costs no request.
+    assert session.gets == [
+        f"{JENKINS_URL}/api/json?tree={JOBS_TREE}",
+        f"{JENKINS_URL}/level-1/level-2/level-3/level-4/api/json?tree={JOBS_TREE}",
+    ]
@@ -0,0 +1,112 @@
+"""
+Tests for the logger package.
+"""
+
+import gc
+import os
+import logging
+import weakref
+
+from packages.logger.logger import (
+    BufferedRotatingFileHandler, FastStreamHandler, setup_app_logger
+)
+
+
+def make_record(message):
+    """
+    Build an INFO log record with a message.
+    """
+    return logging.makeLogRecord({'msg': message, 'levelno': logging.INFO})
+
+
+def make_handler(log_file_path, **kwargs):
+    """
+    Build a file handler that writes only the messages and never flushes on its own.
+    """
+    kwargs.setdefault('maxBytes', 5 * 1024 * 1024)
+    handler = BufferedRotatingFileHandler(
+        filename=str(log_file_path), mode='a', backupCount=5, encoding='utf8',
+        flush_interval=1000, **kwargs
+    )
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    return handler
+
+
+def test_records_stay_in_buffer_until_flush(tmp_path):
+    log_file_path = tmp_path / 'app.log'
+    handler = make_handler(log_file_path)
+    try:
+        for index in range(200):
+            handler.handle(make_record(f'record {index:05d}'))
+
+        # Deciding on a rollover must not flush the buffer
+        assert os.path.getsize(log_file_path) == 0
+
+        handler.flush_buffer()
+        assert os.path.getsize(log_file_path) == 200 * len('record 00000\n')
+    finally:
+        handler.close()
+
+
+
+def test_closed_handler_is_released(tmp_path):
+    handler = make_handler(tmp_path / 'app.log')
+    handler.handle(make_record('record'))
+    handler.close()
+    handler._flush_thread.join()
+
+    # The exit hook of a closed handler must not keep it alive
+    handler_ref = weakref.ref(handler)
+    del handler
+    gc.collect()
+    assert handler_ref() is None
+
+
+def test_rollover_keeps_all_records_in_order(tmp_path):
+    log_file_path = tmp_path / 'app.log'
+    handler = make_handler(log_file_path, maxBytes=2000)
+    for index in range(1000):
+        handler.handle(make_record(f'record {index:05d}'))
+    handler.close()
+
+    # Every file stays below maxBytes, and the backups hold the older records
+    names = [f'app.log.{index}' for index in range(5, 0, -1)] + ['app.log']
+    lines = []
+    for name in names:
+        assert os.path.getsize(tmp_path / name) < 2000
+        lines += (tmp_path / name).read_text(encoding='utf8').splitlines()
+    numbers = [int(line.split()[1]) for line in lines]
+    assert numbers == list(range(numbers[0], 1000))
+
+
+def test_buffer_size_sets_the_write_chunks(tmp_path):
+    record_size = len('record 00000\n')
+    for buffer_size in (1024, 4096):
+        log_file_path = tmp_path / f'app-{buffer_size}.log'
+        handler = make_handler(log_file_path, buffer_size=buffer_size)
+        try:
+            for index in range(1000):
+                handler.handle(make_record(f'record {index:05d}'))
+
+            # Only the records that do not fill a whole buffer are still in memory
+            total_size = 1000 * record_size
+            size_on_disk = os.path.getsize(log_file_path)
+            assert total_size - buffer_size <= size_on_disk < total_size
+        finally:
+            handler.close()
+
+
+def test_console_handler_without_stdout_file_descriptor(capsys):
+    # capsys replaces sys.stdout with a stream that has no file descriptor
+    test_logger = setup_app_logger(logger_name='console-test')
+    assert isinstance(test_logger._listener.handlers[0], logging.StreamHandler)
+
+
+def test_console_handler_uses_the_stream_encoding(tmp_path):
+    output_path = tmp_path / 'console.txt'
+    with open(output_path, 'w', encoding='cp1252', errors='replace') as stream:
+        handler = FastStreamHandler(fd=stream.fileno(), stream=stream)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        handler.handle(make_record('job café ✓'))
+
+    assert output_path.read_bytes() == 'job café ?\n'.encode('cp1252')